@@ -6,33 +6,186 @@ This is a completion system that implements:
 4. Dynamic property set and value path discovery
 """
 
+import bisect
+import heapq
+import itertools
 import re
 import sys
-from typing import Dict, Set, Any, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterator, Set, Any, List, Optional, Tuple
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
 import ifcopenshell
 import ifcopenshell.util.selector
 import ifcopenshell.util.element
-from .debug import debug_print
+from .debug import debug_print, is_debug_enabled
+
+# Patterns used on every keystroke, compiled once at import
+# IFC class followed by a comma, e.g. "IfcWall, "
+_IFC_CLASS_COMMA_RE = re.compile(r"Ifc[A-Za-z0-9]+\s*,\s*")
+# IFC class followed by whitespace, e.g. "IfcWall "
+_IFC_CLASS_SPACE_RE = re.compile(r"Ifc[A-Za-z0-9]+\s+$")
+# Last word of a value path, after the final dot
+_VALUE_WORD_RE = re.compile(r"[^.\s]*$")
+# Current word of a filter query. The alternatives are tried in order from
+# the start of the text, each after the shortest prefix that lets it match:
+# the partial value of the first comparison, e.g. "Name=Ext"; a trailing
+# "!"; a negated word, e.g. "! Ifc"; a name followed by a dot, e.g.
+# "Pset_WallCommon."; and the last word, after a separator
+_CURRENT_WORD_RE = re.compile(
+    r"(?:"
+    r"[\s\S]*?\w+\s*(?:>=|<=|!=|\*=|!\*=|>|<|=)\s*(?P<value>.*)$"
+    r"|(?P<bang>[\s\S]*!)\Z"
+    r"|[\s\S]*?!\s*(?P<negated>[A-Za-z]*)$"
+    r"|(?P<dot>[\s\S]*?[A-Za-z0-9_]\.\s*)$"
+    r"|[\s\S]*?(?P<word>[^,+\s]*)$"
+    r")"
+)
+# Attribute followed by a comparison operator, e.g. "Name="
+_COMPARISON_RE = re.compile(r"(\w+)\s*(>=|<=|!=|\*=|!\*=|>|<|=)\s*")
+# Property set name followed by a dot, e.g. "Pset_WallCommon."
+_PSET_DOT_RE = re.compile(r"([PQE][a-zA-Z0-9_]+)\.\s*$")
+# Partial property set name after a separator, e.g. ", Pset_"
+_PSET_PREFIX_RE = re.compile(r"[,\s]([PQE][a-zA-Z0-9_]*)\s*$")
+# Word after a separator, e.g. ", Name"
+_TRAILING_WORD_RE = re.compile(r"[,\s]([A-Za-z_][A-Za-z0-9_]*)\s*$")
+# Trailing comma, e.g. "IfcWall, "
+_TRAILING_COMMA_RE = re.compile(r",\s*$")
+# Partial word after a union, e.g. "IfcWall + IfcD"
+_UNION_WORD_RE = re.compile(r"[+]\s*[A-Za-z]*$")
+# Partial word at the start of a query
+_LEADING_WORD_RE = re.compile(r"^\s*[A-Za-z]*$")
+# Property set name, e.g. "Pset_WallCommon"
+_PSET_NAME_RE = re.compile(r"^(Pset_|Qto_|EPset_|[A-Z]\w*_\w+)$")
+# Property set property before a comparison, e.g. "Pset_WallCommon.IsExternal="
+_PSET_PROPERTY_COMPARISON_RE = re.compile(
+    r"([PQE][a-zA-Z0-9_]+\.[A-Za-z0-9_]+)\s*[>=<!]"
+)
+# Attribute before a comparison, e.g. "Name="
+_ATTRIBUTE_COMPARISON_RE = re.compile(r"(\w+)\s*[>=<!]")
+# Filter before a property set and dot, e.g. "IfcWall, Pset_WallCommon."
+_FILTER_BEFORE_PSET_DOT_RE = re.compile(r"^(.+?),\s*[PQE][a-zA-Z0-9_]+\.\s*$")
+# Filter before a comma and comparison, e.g. "IfcWall, Name="
+_FILTER_BEFORE_COMMA_COMPARISON_RE = re.compile(r"^(.+?),\s*\w+\s*[>=<!]+\s*")
+# Filter before a space and comparison, e.g. "IfcWall Name="
+_FILTER_BEFORE_SPACE_COMPARISON_RE = re.compile(r"^(.+?)\s+\w+\s*[>=<!]+\s*")
+
+# Index completions offered for list results, which are capped at ten
+_INDEX_STRINGS = tuple(str(i) for i in range(10))
+
+# Maximum number of (filter query, value path) results kept per completer
+_VALUE_COMPLETION_CACHE_SIZE = 256
+# Maximum number of filter query results kept per completer
+_FILTER_CACHE_SIZE = 32
+# Number of filtered elements sampled for value completions
+_VALUE_SAMPLE_SIZE = 50
+# Number of filtered elements first read for the values offered after "=",
+# and the wider sample read if those have no values
+_ATTRIBUTE_VALUE_SAMPLE_SIZE = 64
+_ATTRIBUTE_VALUE_SCAN_LIMIT = 1024
+# Maximum number of results kept per completer for parsing the text typed
+_TEXT_CACHE_SIZE = 256
+# Maximum number of elements whose property sets are kept per completer
+_PSET_CACHE_SIZE = 4096
+# Shortest current word completed without an explicit completion request (Tab)
+_MIN_UNREQUESTED_WORD_LENGTH = 2
+
+
+def _lru_store(cache: OrderedDict, key: Any, value: Any, maxsize: int) -> None:
+    """Store value in an OrderedDict used as an LRU cache, evicting the oldest."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _safe_get_value(get_element_value: Any, element: Any, value_query: str) -> Any:
+    """Get a value query result for an element, or None if it fails."""
+    try:
+        return get_element_value(element, value_query)
+    except Exception:
+        return None
 
 
-class IfcCompleter(Completer):
+# Returned by _format_filter_value() for booleans, offered as TRUE/FALSE
+_BOOLEAN_VALUE = object()
+
+
+def _format_filter_value(value: Any) -> Any:
+    """Quote a value for a filter comparison, or None if it is not offered.
+
+    The exact types returned by ifcopenshell are checked first, so the
+    common cases avoid isinstance() checks and string formatting.
     """
-    Unified IFC completer supporting both filter queries and value extraction.
+    value_type = type(value)
+    if value_type is str:
+        value = value.strip()
+        return '"' + value + '"' if value else None
+    if value_type is bool:
+        return _BOOLEAN_VALUE
+    if value_type is int or value_type is float:
+        return '"' + str(value) + '"'
+    if value is None:
+        return None
+
+    # Subclasses of the basic types
+    if isinstance(value, bool):
+        return _BOOLEAN_VALUE
+    if isinstance(value, str):
+        value = value.strip()
+        return '"' + value + '"' if value else None
+    if isinstance(value, (int, float)):
+        return '"' + str(value) + '"'
+    return None
+
+
+def _stride_sample(elements: Any, size: int) -> List:
+    """Take up to size elements spread evenly across elements."""
+    try:
+        count = len(elements)
+    except TypeError:
+        # Unsized iterables are sampled from the start
+        return list(itertools.islice(elements, size))
+    if count <= size:
+        return list(elements)
+    if not isinstance(elements, (list, tuple)):
+        # filter_elements() returns a set, which cannot be indexed
+        elements = list(elements)
+    # Spread the picks over the whole result, including its last part
+    return [elements[i * count // size] for i in range(size)]
+
+
+def _prefix_matches(lowers: List[str], names: List[str], prefix: str) -> List[str]:
+    """Get the names whose lower-cased form starts with prefix, sorted.
+
+    lowers must be sorted, so the matches are one contiguous run found by
+    bisection instead of testing every name.
     """
+    start = bisect.bisect_left(lowers, prefix)
+    end = start
+    while end < len(lowers) and lowers[end].startswith(prefix):
+        end += 1
+    return sorted(names[start:end])
 
-    def __init__(self, model: ifcopenshell.file):
-        """Initialize completer with IFC model."""
-        self.model = model
 
-        # Lazy-loaded caches (only for basic model structure)
-        self._ifc_classes: Optional[Set[str]] = None
-        self._basic_property_sets: Optional[Set[str]] = None
-        self._basic_properties: Optional[Dict[str, Set[str]]] = None
+def _merge_sorted_unique(*sources: List[str]) -> Iterator[str]:
+    """Merge sorted lists of completions, dropping repeats."""
+    previous = None
+    for completion_text in heapq.merge(*sources):
+        if completion_text != previous:
+            yield completion_text
+            previous = completion_text
 
-        # Core IFC completion data
-        self.selector_keywords = {
+
+class IfcCompleter(Completer):
+    """
+    Unified IFC completer supporting both filter queries and value extraction.
+    """
+
+    # Core IFC completion data, fixed for every model and shared by all
+    # completers
+    selector_keywords: FrozenSet[str] = frozenset(
+        {
             "id",
             "class",
             "predefined_type",
@@ -64,8 +217,10 @@ class IfcCompleter(Completer):
             "elevation",
             "count",
         }
+    )
 
-        self.filter_keywords = {
+    filter_keywords: FrozenSet[str] = frozenset(
+        {
             "material",
             "type",
             "location",
@@ -73,8 +228,10 @@ class IfcCompleter(Completer):
             "classification",
             "query",
         }
+    )
 
-        self.common_attributes = {
+    common_attributes: FrozenSet[str] = frozenset(
+        {
             "Name",
             "Description",
             "GlobalId",
@@ -86,8 +243,71 @@ class IfcCompleter(Completer):
             "Length",
             "Thickness",
         }
+    )
+
+    comparison_operators: FrozenSet[str] = frozenset(
+        {"=", "!=", ">", ">=", "<", "<=", "*=", "!*="}
+    )
+
+    # Value paths offered at the start of every value query, and for any
+    # partial path that matches nothing more specific
+    _root_value_paths: FrozenSet[str] = selector_keywords | common_attributes
+    # Words after which a comparison operator is offered
+    _comparable_words: FrozenSet[str] = filter_keywords | common_attributes
+
+    def __init__(self, model: ifcopenshell.file):
+        """Initialize completer with IFC model."""
+        self.model = model
 
-        self.comparison_operators = {"=", "!=", ">", ">=", "<", "<=", "*=", "!*="}
+        # Lazy-loaded caches (only for basic model structure)
+        self._ifc_classes: Optional[Set[str]] = None
+        # Schema declaration lookup for the model, resolved on first use
+        self._schema: Optional[Any] = None
+        # IFC class names sorted by lower-case name, for prefix lookups
+        self._ifc_class_index: Optional[Tuple[List[str], List[str]]] = None
+
+        # Value completions per (filter query, value path), sorted and paired
+        # with their match text; the model does not change during a session,
+        # so entries only need evicting for size
+        self._value_completion_cache: (
+            "OrderedDict[Tuple[str, str], Tuple[Tuple[str, str], ...]]"
+        ) = OrderedDict()
+        # filter_elements() results per filter query, which stays the same
+        # while the user types the rest of a query
+        self._filter_cache: "OrderedDict[str, List]" = OrderedDict()
+        # Match texts and completions offered after a filter, sorted for bisect
+        self._filter_candidate_cache: (
+            "OrderedDict[str, Tuple[List[str], List[str]]]"
+        ) = OrderedDict()
+        # Attribute values per (filter query, attribute) offered after "="
+        self._attribute_value_cache: "OrderedDict[Tuple[str, str], FrozenSet[str]]" = (
+            OrderedDict()
+        )
+        # Elements sampled for value completions per filter query
+        self._value_samples: "OrderedDict[str, List]" = OrderedDict()
+        # Completion type, cumulative filter and current word per text before
+        # the cursor, which repeat as the menu is redrawn and text is deleted
+        # and retyped
+        self._completion_type_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cumulative_filter_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._current_word_cache: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        # Context, lower-cased word and sorted matches of the last filter
+        # completion, narrowed as the word is extended
+        self._last_filter_matches: Optional[
+            Tuple[Tuple[str, str, str], str, List[str]]
+        ] = None
+        # Attribute names per IFC class, shared by every entity of that class
+        self._class_attribute_cache: Dict[str, FrozenSet[str]] = {}
+        # get_psets() results per element, shared by every property set
+        # completion; the model is not modified while the shell runs
+        self._pset_cache: "OrderedDict[Any, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        # Upper-case class attribute names of plain Python value types
+        self._type_attribute_cache: Dict[type, FrozenSet[str]] = {}
+        # First element of each class per element list, keyed by list id; the
+        # list is stored too so its id cannot be reused while cached
+        self._class_sample_cache: "OrderedDict[int, Tuple[List, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
 
         debug_print("Enhanced IfcCompleter initialized")
 
@@ -96,12 +316,27 @@ class IfcCompleter(Completer):
         text = document.text
         cursor_pos = document.cursor_position
 
-        debug_print(f"IfcCompleter called: '{text}', cursor at {cursor_pos}")
+        # Debug messages on the keystroke path are only formatted when they
+        # will be printed
+        debug = is_debug_enabled()
+        if debug:
+            debug_print(f"IfcCompleter called: '{text}', cursor at {cursor_pos}")
 
         try:
             # Analyze completion context
             context = self._analyze_completion_context(text, cursor_pos)
-            debug_print(f"Context analysis: {context}")
+            if debug:
+                debug_print(f"Context analysis: {context}")
+
+            # A nearly empty word under the cursor matches almost everything
+            # in its context, so only complete it when explicitly asked to
+            current_word = context.get("current_word", "")
+            if (
+                complete_event is not None
+                and not complete_event.completion_requested
+                and len(current_word) < _MIN_UNREQUESTED_WORD_LENGTH
+            ):
+                return
 
             if context["type"] == "filter":
                 yield from self._get_filter_completions(context)
@@ -115,18 +350,16 @@ class IfcCompleter(Completer):
 
     def _analyze_completion_context(self, text: str, cursor_pos: int) -> Dict[str, Any]:
         """Analyze text and cursor position to determine completion context."""
-        debug_print(f"Analyzing context: '{text}' at position {cursor_pos}")
+        if is_debug_enabled():
+            debug_print(f"Analyzing context: '{text}' at position {cursor_pos}")
 
         # Determine if we're in filter or value extraction context
-        semicolon_positions = [i for i, char in enumerate(text) if char == ";"]
+        first_semicolon = text.find(";")
 
-        if not semicolon_positions:
+        if first_semicolon < 0:
             # No semicolons - definitely filter context
             return self._analyze_filter_context(text, cursor_pos)
 
-        # Find which semicolon section we're in
-        first_semicolon = semicolon_positions[0]
-
         if cursor_pos <= first_semicolon:
             # Before first semicolon - filter context
             filter_text = text[:cursor_pos]
@@ -135,12 +368,8 @@ class IfcCompleter(Completer):
             # After first semicolon - value extraction context
             filter_query = text[:first_semicolon].strip()
 
-            # Find which value query section we're in
-            remaining_text = text[first_semicolon + 1 :]
-            remaining_cursor = cursor_pos - first_semicolon - 1
-
             return self._analyze_value_context(
-                filter_query, remaining_text, remaining_cursor
+                filter_query, text, first_semicolon, cursor_pos
             )
 
     def _analyze_filter_context(self, text: str, cursor_pos: int) -> Dict[str, Any]:
@@ -148,7 +377,9 @@ class IfcCompleter(Completer):
         text_before_cursor = text[:cursor_pos]
 
         # Parse current word and position
-        current_word, start_position = self._parse_current_word(text_before_cursor)
+        current_word, start_position = self._memoize_text(
+            self._current_word_cache, self._parse_current_word, text_before_cursor
+        )
 
         return {
             "type": "filter",
@@ -159,36 +390,15 @@ class IfcCompleter(Completer):
         }
 
     def _analyze_value_context(
-        self, filter_query: str, remaining_text: str, remaining_cursor: int
+        self, filter_query: str, text: str, first_semicolon: int, cursor_pos: int
     ) -> Dict[str, Any]:
         """Analyze value extraction context."""
-        # Split remaining text by semicolons to find current value query
-        value_parts = remaining_text.split(";")
-
-        # Find which part the cursor is in
-        current_pos = 0
-        current_part_index = 0
-
-        for i, part in enumerate(value_parts):
-            part_end = current_pos + len(part)
-            if remaining_cursor <= part_end:
-                current_part_index = i
-                break
-            current_pos = part_end + 1
-
-        if current_part_index < len(value_parts):
-            current_part = value_parts[current_part_index]
-            cursor_in_part = remaining_cursor - sum(
-                len(value_parts[j]) + 1 for j in range(current_part_index)
-            )
-            if cursor_in_part < 0:
-                cursor_in_part = 0
-            elif cursor_in_part > len(current_part):
-                cursor_in_part = len(current_part)
-
-            current_value_path = current_part[:cursor_in_part].strip()
-        else:
-            current_value_path = ""
+        # The cursor's value query starts after the last semicolon before the
+        # cursor, which is at least the one ending the filter query; a cursor
+        # right before a semicolon stays in the earlier query. Searching the
+        # full text in place avoids copying the value queries out of it
+        part_start = text.rfind(";", first_semicolon, cursor_pos) + 1
+        current_value_path = text[part_start:cursor_pos].strip()
 
         # Parse current word in value context
         current_word, start_position = self._parse_value_word(current_value_path)
@@ -203,35 +413,15 @@ class IfcCompleter(Completer):
 
     def _parse_current_word(self, text_before_cursor: str) -> Tuple[str, int]:
         """Parse current word and start position for filter context."""
-        # Handle comparison operators
-        comparison_match = re.search(
-            r"(\w+)\s*(>=|<=|!=|\*=|!\*=|>|<|=)\s*(.*)$", text_before_cursor
-        )
-        if comparison_match:
-            partial_value = comparison_match.group(3)
-            return partial_value, -len(partial_value) if partial_value else 0
-
-        # Handle negation
-        if text_before_cursor.endswith("!"):
+        # One match covers, in order: a comparison with a partial value, a
+        # trailing negation, a negated word, a name followed by a dot, and
+        # the plain last word
+        match = _CURRENT_WORD_RE.match(text_before_cursor)
+        if match is None or match.lastgroup in ("bang", "dot"):
             return "", 0
 
-        negation_match = re.search(r"!\s*([A-Za-z]*)$", text_before_cursor)
-        if negation_match:
-            word = negation_match.group(1)
-            return word, -len(word) if word else 0
-
-        # Handle property set patterns
-        pset_dot_match = re.search(r"([A-Za-z0-9_]+)\.\s*$", text_before_cursor)
-        if pset_dot_match:
-            return "", 0
-
-        # Default word parsing
-        word_match = re.search(r"[^,+\s]*$", text_before_cursor)
-        if word_match:
-            word = word_match.group()
-            return word, -len(word) if word else 0
-
-        return "", 0
+        word = match.group(match.lastgroup)
+        return word, -len(word) if word else 0
 
     def _parse_value_word(self, value_path: str) -> Tuple[str, int]:
         """Parse current word and start position for value context."""
@@ -239,7 +429,7 @@ class IfcCompleter(Completer):
             return "", 0
 
         # Find last word after dot or at start
-        word_match = re.search(r"[^.\s]*$", value_path)
+        word_match = _VALUE_WORD_RE.search(value_path)
         if word_match:
             word = word_match.group()
             return word, -len(word) if word else 0
@@ -252,52 +442,81 @@ class IfcCompleter(Completer):
         current_word = context["current_word"]
         start_position = context["start_position"]
 
-        debug_print(f"Getting filter completions for: '{text_before_cursor}'")
+        debug = is_debug_enabled()
+        if debug:
+            debug_print(f"Getting filter completions for: '{text_before_cursor}'")
 
         try:
             # Determine what type of completion is needed
-            completion_type = self._determine_filter_completion_type(text_before_cursor)
-            debug_print(f"Filter completion type: {completion_type}")
+            completion_type = self._memoize_text(
+                self._completion_type_cache,
+                self._determine_filter_completion_type,
+                text_before_cursor,
+            )
+            if debug:
+                debug_print(f"Filter completion type: {completion_type}")
+
+            # While the user extends the current word with the rest of the
+            # text unchanged, the new matches are a subset of the last ones
+            word = current_word.lower()
+            context_key = (
+                completion_type,
+                text_before_cursor[: len(text_before_cursor) - len(current_word)],
+                self._memoize_text(
+                    self._cumulative_filter_cache,
+                    self._extract_cumulative_filter,
+                    text_before_cursor,
+                ),
+            )
+            last = self._last_filter_matches
+            if last is not None and last[0] == context_key and word.startswith(last[1]):
+                matches = [
+                    completion_text
+                    for completion_text in last[2]
+                    if self._match_text(completion_text).startswith(word)
+                ]
+                self._last_filter_matches = (context_key, word, matches)
+                for completion_text in matches:
+                    yield Completion(
+                        text=completion_text, start_position=start_position
+                    )
+                return
 
             completions = set()
+            # Already sorted matches from the class index and cached candidates
+            class_matches: List[str] = []
+            candidate_matches: List[str] = []
 
             if completion_type == "ifc_classes":
-                completions.update(self._get_ifc_classes())
+                # Jump straight to matching classes instead of testing each one
+                for completion_text in self._get_ifc_classes_with_prefix(current_word):
+                    yield Completion(
+                        text=completion_text, start_position=start_position
+                    )
+                return
 
             elif completion_type == "attributes_and_keywords":
-                # Extract cumulative filter to get relevant classes
-                cumulative_filter = self._extract_cumulative_filter(text_before_cursor)
-                debug_print(f"Cumulative filter: '{cumulative_filter}'")
+                # Cumulative filter to get relevant classes, already
+                # extracted for the context key
+                cumulative_filter = context_key[2]
+                if debug:
+                    debug_print(f"Cumulative filter: '{cumulative_filter}'")
 
                 # ALWAYS add IFC classes for union queries (e.g., "IfcWall, IfcWindow, Ifc...")
-                completions.update(self._get_ifc_classes())
-
-                # ALWAYS add filter keywords
-                completions.update(self.filter_keywords)
-
-                # If we have a valid filter, get ALL elements that match it
-                if cumulative_filter.strip():
-                    try:
-                        elements = self._apply_cumulative_filter(cumulative_filter)
-                        debug_print(f"Selector query returned {len(elements)} elements")
-
-                        if elements:
-                            # Extract actual attributes that exist on these specific elements
-                            attributes = self._extract_attributes_from_elements(elements)
-                            completions.update(attributes)
-
-                            # Extract actual property sets from these specific elements
-                            pset_names = self._extract_property_set_names(elements)
-                            completions.update(pset_names)
-                    except Exception as e:
-                        debug_print(f"Error running selector query '{cumulative_filter}': {e}")
+                class_matches = self._get_ifc_classes_with_prefix(current_word)
 
-                # Always add property set patterns for typing convenience
-                completions.add("Pset_")
-                completions.add("Qto_")
+                # Keywords, attributes and property sets for the filter, kept
+                # sorted with their match text
+                candidate_matches = _prefix_matches(
+                    *self._get_filter_candidates(cumulative_filter), word
+                )
 
             elif completion_type == "property_set_names":
-                cumulative_filter = self._extract_cumulative_filter(text_before_cursor)
+                cumulative_filter = self._memoize_text(
+                    self._cumulative_filter_cache,
+                    self._extract_cumulative_filter,
+                    text_before_cursor,
+                )
                 elements = self._apply_cumulative_filter(cumulative_filter)
 
                 prefix = self._extract_property_set_prefix(text_before_cursor)
@@ -308,12 +527,18 @@ class IfcCompleter(Completer):
             elif completion_type == "property_names":
                 # Extract property set name from the current query
                 pset_name = self._extract_property_set_name(text_before_cursor)
-                debug_print(f"Extracting properties for property set: '{pset_name}'")
+                if debug:
+                    debug_print(
+                        f"Extracting properties for property set: '{pset_name}'"
+                    )
 
                 # FIXED: Don't include the ".PropertyName" part in the cumulative filter
                 # Remove the property set reference to get a valid filter query
                 cumulative_filter = self._extract_cumulative_filter_before_pset_dot(text_before_cursor)
-                debug_print(f"Cumulative filter (before pset.): '{cumulative_filter}'")
+                if debug:
+                    debug_print(
+                        f"Cumulative filter (before pset.): '{cumulative_filter}'"
+                    )
 
                 elements = self._apply_cumulative_filter(cumulative_filter)
 
@@ -325,23 +550,30 @@ class IfcCompleter(Completer):
                 # FIXED: Remove the "=value" part to get a valid filter query
                 attribute_name = self._extract_attribute_name(text_before_cursor)
                 cumulative_filter = self._extract_cumulative_filter_before_equals(text_before_cursor)
-                debug_print(f"Cumulative filter (before =): '{cumulative_filter}'")
-                debug_print(f"Attribute name: '{attribute_name}'")
+                if debug:
+                    debug_print(f"Cumulative filter (before =): '{cumulative_filter}'")
+                    debug_print(f"Attribute name: '{attribute_name}'")
 
-                elements = self._apply_cumulative_filter(cumulative_filter)
-
-                if elements and attribute_name:
-                    values = self._extract_attribute_values(elements, attribute_name)
+                if attribute_name:
+                    values = self._get_attribute_values(
+                        cumulative_filter, attribute_name
+                    )
                     completions.update(values)
-                    debug_print(f"Found {len(values)} attribute values")
+                    if debug:
+                        debug_print(f"Found {len(values)} attribute values")
 
             elif completion_type == "comparison_operators":
                 completions.update(self.comparison_operators)
 
             # Filter completions by current word and yield
-            for completion_text in sorted(completions):
-                if self._matches_word(completion_text, current_word):
-                    yield Completion(text=completion_text, start_position=start_position)
+            matches = self._sorted_matches(completions, current_word)
+            if class_matches or candidate_matches:
+                matches = list(
+                    _merge_sorted_unique(matches, class_matches, candidate_matches)
+                )
+            self._last_filter_matches = (context_key, word, matches)
+            for completion_text in matches:
+                yield Completion(text=completion_text, start_position=start_position)
 
         except Exception as e:
             debug_print(f"Filter completion error: {e}")
@@ -355,46 +587,68 @@ class IfcCompleter(Completer):
         current_word = context["current_word"]
         start_position = context["start_position"]
 
-        debug_print(
-            f"Getting value completions for filter: '{filter_query}', path: '{current_value_path}', word: '{current_word}'"
-        )
+        debug = is_debug_enabled()
+        if debug:
+            debug_print(
+                f"Getting value completions for filter: '{filter_query}', path: '{current_value_path}', word: '{current_word}'"
+            )
 
         try:
-            # Apply filter to get relevant elements
-            elements = self._apply_cumulative_filter(filter_query)
-            debug_print(f"Filter returned {len(elements)} elements")
-
-            if not elements:
-                debug_print("No elements found, returning empty completions")
-                return
+            # Reuse results while the user types within the same query and path
+            cache_key = (filter_query.strip(), current_value_path)
+            entries = self._value_completion_cache.get(cache_key)
+
+            if entries is not None:
+                self._value_completion_cache.move_to_end(cache_key)
+                if debug:
+                    debug_print(f"Using {len(entries)} cached value completions")
             else:
                 # IMPROVED: Sample more elements for better attribute discovery
                 # Use up to 50 elements (or all if fewer) for comprehensive completion
-                sample_size = min(50, len(elements))
-                sampled_elements = elements[:sample_size]
-                debug_print(f"Sampling {sample_size} elements for value completions")
+                sampled_elements = self._get_value_sample(filter_query)
+
+                if not sampled_elements:
+                    debug_print("No elements found, returning empty completions")
+                    return
+
+                debug_print(
+                    f"Sampling {len(sampled_elements)} elements for value completions"
+                )
 
                 completions = self._resolve_value_path_completions(
                     sampled_elements, current_value_path
                 )
-                debug_print(f"Resolved {len(completions)} value completions")
+                entries = tuple(
+                    (self._match_text(completion_text), completion_text)
+                    for completion_text in sorted(completions)
+                )
+                _lru_store(
+                    self._value_completion_cache,
+                    cache_key,
+                    entries,
+                    _VALUE_COMPLETION_CACHE_SIZE,
+                )
+                debug_print(f"Resolved {len(entries)} value completions")
 
             # Filter and yield completions
             yielded = 0
-            for completion_text in sorted(completions):
-                if self._matches_word(completion_text, current_word):
+            word = current_word.lower()
+            for match_text, completion_text in entries:
+                if match_text.startswith(word):
                     yield Completion(
                         text=completion_text, start_position=start_position
                     )
                     yielded += 1
 
-            debug_print(f"Yielded {yielded} filtered completions")
+            if debug:
+                debug_print(f"Yielded {yielded} filtered completions")
 
         except Exception as e:
             debug_print(f"Value completion error: {e}")
-            import traceback
+            if is_debug_enabled():
+                import traceback
 
-            debug_print(f"Traceback: {traceback.format_exc()}")
+                debug_print(f"Traceback: {traceback.format_exc()}")
             # NO FALLBACKS - let it fail cleanly
             return
 
@@ -409,8 +663,7 @@ class IfcCompleter(Completer):
         try:
             if not current_value_path:
                 # Base level - return common value paths
-                completions.update(self.selector_keywords)
-                completions.update(self.common_attributes)
+                completions.update(self._root_value_paths)
 
                 # IMPROVED: Add actual attributes from the filtered elements
                 actual_attributes = self._extract_attributes_from_elements(elements)
@@ -420,7 +673,7 @@ class IfcCompleter(Completer):
                 # Add property sets available on these elements
                 for element in elements:
                     try:
-                        psets = ifcopenshell.util.element.get_psets(element)
+                        psets = self._get_psets(element)
                         completions.update(psets.keys())
                     except Exception:
                         continue
@@ -435,7 +688,7 @@ class IfcCompleter(Completer):
 
                 for element in elements:
                     try:
-                        psets = ifcopenshell.util.element.get_psets(element)
+                        psets = self._get_psets(element)
                         if pset_name in psets:
                             for prop_name in psets[pset_name].keys():
                                 if prop_name != "id":
@@ -452,7 +705,7 @@ class IfcCompleter(Completer):
 
                 for element in elements:
                     try:
-                        psets = ifcopenshell.util.element.get_psets(element)
+                        psets = self._get_psets(element)
                         for pset_name in psets.keys():
                             if pset_name.startswith(prefix):
                                 completions.add(pset_name)
@@ -465,7 +718,7 @@ class IfcCompleter(Completer):
             # e.g., "Pset_WallCommon" should also be offered as completion
             for element in elements:
                 try:
-                    psets = ifcopenshell.util.element.get_psets(element)
+                    psets = self._get_psets(element)
                     for pset_name in psets.keys():
                         if pset_name.startswith(current_value_path):
                             completions.add(pset_name)
@@ -474,14 +727,16 @@ class IfcCompleter(Completer):
 
             # Handle path completion (type.Name, material.Category, etc.)
             if "." in current_value_path:
-                path_parts = current_value_path.split(".")
-                if path_parts[-1] == "":
+                partial_path, _, last_part = current_value_path.rpartition(".")
+                if last_part == "":
                     # Completing after dot: "type." -> get attributes of type objects
-                    partial_path = ".".join(path_parts[:-1])
                     debug_print(f"Path completion after dot: '{partial_path}'")
 
                     # Track if we encounter tuple/list results
                     has_tuple_results = False
+                    # Entity results of one class share their attributes,
+                    # so each class only needs inspecting once
+                    inspected_classes = set()
 
                     for element in elements:
                         try:
@@ -492,9 +747,17 @@ class IfcCompleter(Completer):
                                 # Check if this is a tuple/list
                                 if isinstance(result, (list, tuple)):
                                     has_tuple_results = True
-
-                                attrs = self._inspect_object_attributes(result)
-                                completions.update(attrs)
+                                elif isinstance(result, ifcopenshell.entity_instance):
+                                    result_class = result.is_a()
+                                    if result_class in inspected_classes:
+                                        continue
+                                    inspected_classes.add(result_class)
+                                    completions.update(
+                                        self._get_class_attributes(result, result_class)
+                                    )
+                                    continue
+
+                                self._inspect_object_attributes(result, completions)
                         except Exception:
                             continue
 
@@ -510,8 +773,7 @@ class IfcCompleter(Completer):
 
             # Default: try to complete as a partial path
             debug_print(f"Default path completion for: '{current_value_path}'")
-            completions.update(self.selector_keywords)
-            completions.update(self.common_attributes)
+            completions.update(self._root_value_paths)
 
             return completions
 
@@ -520,37 +782,50 @@ class IfcCompleter(Completer):
             # NO FALLBACKS - return empty set
             return set()
 
-    def _inspect_object_attributes(self, obj: Any) -> Set[str]:
-        """Inspect an object to find available attributes."""
-        attributes = set()
+    def _inspect_object_attributes(
+        self, obj: Any, attributes: Optional[Set[str]] = None
+    ) -> Set[str]:
+        """Inspect an object to find available attributes.
+
+        Names are added to attributes when given, so results for many
+        objects are collected in one set instead of one set per object.
+        """
+        if attributes is None:
+            attributes = set()
 
         try:
-            if hasattr(obj, "__dict__"):
-                dict_attrs = [k for k in obj.__dict__.keys() if k and k[0].isupper()]
-                attributes.update(dict_attrs)
+            instance_dict = getattr(obj, "__dict__", None)
+            if instance_dict:
+                attributes.update(k for k in instance_dict if k[:1].isupper())
         except Exception:
             pass
 
         try:
-            for attr_name in dir(obj):
-                if (
-                    attr_name
-                    and attr_name[0].isupper()
-                    and not attr_name.startswith("_")
-                ):
-                    try:
-                        getattr(obj, attr_name)
-                        attributes.add(attr_name)
-                    except Exception:
-                        continue
+            obj_type = type(obj)
+            if obj_type.__dir__ is object.__dir__:
+                # Default dir() is the instance __dict__ (read above) plus the
+                # class attributes, which are the same for every object of
+                # the type
+                type_attributes = self._type_attribute_cache.get(obj_type)
+                if type_attributes is None:
+                    type_attributes = frozenset(
+                        attr_name
+                        for attr_name in dir(obj_type)
+                        if attr_name[:1].isupper()
+                    )
+                    self._type_attribute_cache[obj_type] = type_attributes
+                attributes.update(type_attributes)
+            else:
+                attributes.update(
+                    attr_name for attr_name in dir(obj) if attr_name[:1].isupper()
+                )
         except Exception:
             pass
 
         # Handle lists/tuples
         if isinstance(obj, (list, tuple)):
             attributes.add("count")
-            for i in range(min(len(obj), 10)):
-                attributes.add(str(i))
+            attributes.update(_INDEX_STRINGS[: len(obj)])
 
         return attributes
 
@@ -564,105 +839,218 @@ class IfcCompleter(Completer):
             debug_print("Empty filter query, returning empty list")
             return []
 
+        elements = self._filter_cache.get(filter_query)
+        if elements is not None:
+            self._filter_cache.move_to_end(filter_query)
+            debug_print(f"Using cached filter result: {len(elements)} elements")
+            return elements
+
         try:
             debug_print(f"Applying cumulative filter: '{filter_query}'")
             elements = list(
                 ifcopenshell.util.selector.filter_elements(self.model, filter_query)
             )
             debug_print(f"Filter returned {len(elements)} elements")
-            return elements
         except Exception as e:
             debug_print(f"Filter failed: {e}")
             # NO FALLBACK - let it fail properly so we can see what's wrong
-            return []
+            elements = []
+
+        _lru_store(self._filter_cache, filter_query, elements, _FILTER_CACHE_SIZE)
+        return elements
+
+    def _get_value_sample(self, filter_query: str) -> List:
+        """Get the filtered elements sampled for value completions.
+
+        The sample is kept per filter query so that each value path typed
+        reuses one list, and the class samples cached for it. Only the
+        sampled elements are copied from the filter result. They are spread
+        across it rather than taken from the start, so that a filter over
+        several classes is not sampled from the first class in the file.
+        """
+        sample = self._value_samples.get(filter_query)
+        if sample is not None:
+            self._value_samples.move_to_end(filter_query)
+            return sample
+
+        elements = self._filter_cache.get(filter_query)
+        if elements is not None:
+            sample = _stride_sample(elements, _VALUE_SAMPLE_SIZE)
+        elif not filter_query.strip():
+            sample = []
+        else:
+            try:
+                debug_print(f"Applying filter for value sample: '{filter_query}'")
+                sample = _stride_sample(
+                    ifcopenshell.util.selector.filter_elements(
+                        self.model, filter_query
+                    ),
+                    _VALUE_SAMPLE_SIZE,
+                )
+            except Exception as e:
+                debug_print(f"Filter failed: {e}")
+                sample = []
+
+        _lru_store(self._value_samples, filter_query, sample, _FILTER_CACHE_SIZE)
+        return sample
 
     def _extract_attributes_from_elements(self, elements: List) -> Set[str]:
         """Extract actual attributes from all filtered elements."""
         attributes = set()
-        processed_classes = set()
 
-        for element in elements:
+        # Entities of one class share their attributes, so inspect each class
+        # once and reuse the result across completions
+        for class_name, element in self._get_class_samples(elements).items():
             try:
-                class_name = element.is_a()
-
-                # Only process schema for each class once
-                if class_name not in processed_classes:
-                    processed_classes.add(class_name)
-
-                    # Method 1: Check IFC schema attributes for this class
-                    try:
-                        # FIXED: Get the actual schema object from ifcopenshell
-                        import ifcopenshell.ifcopenshell_wrapper as wrapper
-                        schema = wrapper.schema_by_name(self.model.schema)
-
-                        class_def = schema.declaration_by_name(class_name)
-                        if class_def and hasattr(class_def, "all_attributes"):
-                            for attr in class_def.all_attributes():
-                                if hasattr(attr, "name"):
-                                    attr_name = attr.name()
-                                    if attr_name and attr_name[0].isupper():
-                                        attributes.add(attr_name)
-                    except Exception:
-                        pass
-
-                # Method 2: Check actual attribute values on element
-                try:
-                    for attr_name in dir(element):
-                        if (
-                            attr_name
-                            and attr_name[0].isupper()
-                            and not attr_name.startswith("_")
-                            and not callable(getattr(element, attr_name, None))
-                        ):
-                            try:
-                                getattr(element, attr_name)
-                                attributes.add(attr_name)
-                            except Exception:
-                                continue
-                except Exception:
-                    pass
-
-                # Method 3: Check __dict__ for stored attributes
-                try:
-                    if hasattr(element, "__dict__"):
-                        for attr_name in element.__dict__.keys():
-                            if attr_name and attr_name[0].isupper():
-                                attributes.add(attr_name)
-                except Exception:
-                    pass
+                attributes.update(self._get_class_attributes(element, class_name))
 
             except Exception:
                 continue
 
-        # Method 4: Test common IFC attributes on sample elements
+        # Method 4: Test common IFC attributes on sample elements. The class
+        # attributes of an ifcopenshell entity already list every attribute
+        # it has, so only other objects need probing
         common_ifc_attrs = [
             "Name", "Description", "Tag", "ObjectType", "GlobalId",
             "PredefinedType", "OwnerHistory", "ObjectPlacement", "Representation"
         ]
-        test_elements = elements[: min(10, len(elements))]
+        test_elements = [
+            element
+            for element in elements[:10]
+            if not isinstance(element, ifcopenshell.entity_instance)
+        ]
         for attr_name in common_ifc_attrs:
             for element in test_elements:
+                # A single getattr() both checks and reads the attribute;
+                # hasattr() first would read it twice
                 try:
-                    if hasattr(element, attr_name):
-                        getattr(element, attr_name)
-                        attributes.add(attr_name)
-                        break
+                    getattr(element, attr_name)
                 except Exception:
                     continue
+                attributes.add(attr_name)
+                break
 
         debug_print(f"Extracted {len(attributes)} attributes from {len(elements)} elements")
         return attributes
 
+    def _get_class_attributes(self, element: Any, class_name: str) -> FrozenSet[str]:
+        """Get the attribute names of an IFC class, inspecting it on first use."""
+        class_attributes = self._class_attribute_cache.get(class_name)
+        if class_attributes is None:
+            class_attributes = frozenset(
+                self._inspect_class_attributes(element, class_name)
+            )
+            self._class_attribute_cache[class_name] = class_attributes
+        return class_attributes
+
+    def _get_class_samples(self, elements: List) -> Dict[str, Any]:
+        """Map each IFC class in elements to its first element.
+
+        Filter results are cached as the same list object, so the is_a()
+        call per element is only paid once per filter query.
+        """
+        key = id(elements)
+        cached = self._class_sample_cache.get(key)
+        if cached is not None and cached[0] is elements:
+            self._class_sample_cache.move_to_end(key)
+            return cached[1]
+
+        samples = {}
+        for element in elements:
+            try:
+                samples.setdefault(element.is_a(), element)
+            except Exception:
+                continue
+
+        _lru_store(
+            self._class_sample_cache, key, (elements, samples), _FILTER_CACHE_SIZE
+        )
+        return samples
+
+    def _inspect_class_attributes(self, element: Any, class_name: str) -> Set[str]:
+        """Collect attribute names for an element's class from schema and instance."""
+        attributes = set()
+
+        # Method 1: Check IFC schema attributes for this class
+        schema_complete = False
+        try:
+            class_def = self._get_schema().declaration_by_name(class_name)
+            if class_def and hasattr(class_def, "all_attributes"):
+                # Names are interned, as the same few (Name, GlobalId, ...)
+                # recur in the cached attribute set of almost every class
+                for attr in class_def.all_attributes():
+                    if hasattr(attr, "name"):
+                        attr_name = attr.name()
+                        if attr_name and attr_name[0].isupper():
+                            attributes.add(sys.intern(attr_name))
+
+                # Inverse attributes (IsDefinedBy, ConnectedTo, ...) are the
+                # rest of what an ifcopenshell entity lists in dir()
+                inverse_names = [
+                    attr.name() for attr in class_def.all_inverse_attributes()
+                ]
+                attributes.update(
+                    sys.intern(attr_name)
+                    for attr_name in inverse_names
+                    if attr_name[:1].isupper()
+                )
+                schema_complete = True
+        except Exception:
+            pass
+
+        # For ifcopenshell entities the schema already gives every name, so
+        # skip dir(), which builds and sorts the same list through the wrapper
+        if schema_complete and isinstance(element, ifcopenshell.entity_instance):
+            return attributes
+
+        # Method 2: Attribute names listed by the element itself. Only the
+        # names are needed, so values are not fetched (on ifcopenshell
+        # entities every getattr goes through the C++ wrapper)
+        try:
+            attributes.update(
+                attr_name for attr_name in dir(element) if attr_name[:1].isupper()
+            )
+        except Exception:
+            pass
+
+        # Method 3: Check __dict__ for stored attributes
+        try:
+            instance_dict = getattr(element, "__dict__", None)
+            if instance_dict:
+                attributes.update(
+                    attr_name for attr_name in instance_dict if attr_name[:1].isupper()
+                )
+        except Exception:
+            pass
+
+        return attributes
+
+    def _get_psets(self, element: Any) -> Dict[str, Dict[str, Any]]:
+        """Get the property sets of an element, read once per element.
+
+        Property set and property completions read the same elements on
+        every keystroke, and get_psets() walks the element's relationships
+        each time.
+        """
+        psets = self._pset_cache.get(element)
+        if psets is not None:
+            self._pset_cache.move_to_end(element)
+            return psets
+
+        psets = ifcopenshell.util.element.get_psets(element)
+        _lru_store(self._pset_cache, element, psets, _PSET_CACHE_SIZE)
+        return psets
+
     def _extract_property_set_names(self, elements: List, prefix: str = "") -> Set[str]:
         """Extract property set names from all filtered elements."""
         pset_names = set()
 
         for element in elements:
             try:
-                psets = ifcopenshell.util.element.get_psets(element)
-                for pset_name in psets.keys():
-                    if not prefix or pset_name.startswith(prefix):
-                        pset_names.add(pset_name)
+                psets = self._get_psets(element)
+                pset_names.update(
+                    pset_name for pset_name in psets if pset_name.startswith(prefix)
+                )
             except Exception:
                 continue
 
@@ -675,23 +1063,112 @@ class IfcCompleter(Completer):
 
         for element in elements:
             try:
-                psets = ifcopenshell.util.element.get_psets(element)
+                psets = self._get_psets(element)
                 if pset_name in psets:
-                    for prop_name in psets[pset_name].keys():
-                        if prop_name != "id":
-                            properties.add(prop_name)
+                    properties.update(psets[pset_name])
             except Exception:
                 continue
 
+        # get_psets() includes the property set's own entity id
+        properties.discard("id")
+
         debug_print(f"Found {len(properties)} properties in '{pset_name}'")
         return properties
 
+    def _get_filter_candidates(self, filter_query: str) -> Tuple[List[str], List[str]]:
+        """Get keywords, attributes and property sets to offer after a filter.
+
+        The candidates are the same for every keystroke on one filter, so they
+        are cached as parallel lists sorted by their match text.
+        """
+        entries = self._filter_candidate_cache.get(filter_query)
+        if entries is not None:
+            self._filter_candidate_cache.move_to_end(filter_query)
+            return entries
+
+        # ALWAYS add filter keywords
+        completions = set(self.filter_keywords)
+
+        # If we have a valid filter, get ALL elements that match it
+        if filter_query.strip():
+            try:
+                elements = self._apply_cumulative_filter(filter_query)
+                debug_print(f"Selector query returned {len(elements)} elements")
+
+                if elements:
+                    # Extract actual attributes that exist on these specific elements
+                    attributes = self._extract_attributes_from_elements(elements)
+                    completions.update(attributes)
+
+                    # Extract actual property sets from these specific elements
+                    pset_names = self._extract_property_set_names(elements)
+                    completions.update(pset_names)
+            except Exception as e:
+                debug_print(f"Error running selector query '{filter_query}': {e}")
+
+        # Always add property set patterns for typing convenience
+        completions.add("Pset_")
+        completions.add("Qto_")
+
+        pairs = sorted(
+            (self._match_text(completion_text), completion_text)
+            for completion_text in completions
+        )
+        entries = ([match_text for match_text, _ in pairs], [text for _, text in pairs])
+        _lru_store(
+            self._filter_candidate_cache, filter_query, entries, _FILTER_CACHE_SIZE
+        )
+        return entries
+
+    def _get_attribute_values(
+        self, filter_query: str, attribute_name: str
+    ) -> FrozenSet[str]:
+        """Get the values of an attribute on the elements matching a filter.
+
+        A sample spread across the elements is read, widened once if it
+        finds no values, so large models are not read in full. The result
+        is cached per filter query and attribute while the user types the
+        value.
+        """
+        cache_key = (filter_query, attribute_name)
+        values = self._attribute_value_cache.get(cache_key)
+        if values is not None:
+            self._attribute_value_cache.move_to_end(cache_key)
+            return values
+
+        elements = self._apply_cumulative_filter(filter_query)
+        values = frozenset()
+        if elements:
+            values = frozenset(
+                self._extract_attribute_values(
+                    _stride_sample(elements, _ATTRIBUTE_VALUE_SAMPLE_SIZE),
+                    attribute_name,
+                )
+            )
+            if not values and len(elements) > _ATTRIBUTE_VALUE_SAMPLE_SIZE:
+                values = frozenset(
+                    self._extract_attribute_values(
+                        _stride_sample(elements, _ATTRIBUTE_VALUE_SCAN_LIMIT),
+                        attribute_name,
+                    )
+                )
+        _lru_store(
+            self._attribute_value_cache,
+            cache_key,
+            values,
+            _VALUE_COMPLETION_CACHE_SIZE,
+        )
+        return values
+
     def _extract_attribute_values(
         self, elements: List, attribute_name: str
     ) -> Set[str]:
-        """Extract attribute values from all filtered elements."""
+        """Extract attribute values from all filtered elements.
+
+        Any boolean value makes this a boolean property, offered as TRUE and
+        FALSE, so the remaining elements are not read.
+        """
         values = set()
-        found_boolean = False
 
         # Handle property set properties like "Pset_WallCommon.LoadBearing"
         if "." in attribute_name:
@@ -700,16 +1177,15 @@ class IfcCompleter(Completer):
 
                 for element in elements:
                     try:
-                        psets = ifcopenshell.util.element.get_psets(element)
+                        psets = self._get_psets(element)
                         if pset_name in psets and prop_name in psets[pset_name]:
-                            value = psets[pset_name][prop_name]
-                            if value is not None:
-                                if isinstance(value, bool):
-                                    found_boolean = True
-                                elif isinstance(value, str) and value.strip():
-                                    values.add(f'"{value.strip()}"')
-                                elif isinstance(value, (int, float)):
-                                    values.add(f'"{str(value)}"')
+                            value_text = _format_filter_value(
+                                psets[pset_name][prop_name]
+                            )
+                            if value_text is _BOOLEAN_VALUE:
+                                return {"TRUE", "FALSE"}
+                            if value_text is not None:
+                                values.add(value_text)
                     except Exception:
                         continue
             except ValueError:
@@ -717,25 +1193,16 @@ class IfcCompleter(Completer):
         else:
             # Regular attribute or keyword - use value query mapping
             value_query = self._map_attribute_to_value_query(attribute_name)
+            get_element_value = ifcopenshell.util.selector.get_element_value
 
             for element in elements:
-                try:
-                    value = ifcopenshell.util.selector.get_element_value(
-                        element, value_query
-                    )
-                    if value is not None:
-                        if isinstance(value, bool):
-                            found_boolean = True
-                        elif isinstance(value, str) and value.strip():
-                            values.add(f'"{value.strip()}"')
-                        elif isinstance(value, (int, float)):
-                            values.add(f'"{str(value)}"')
-                except Exception:
-                    continue
-
-        # If any boolean values found, this is a boolean property
-        if found_boolean:
-            return {"TRUE", "FALSE"}
+                value_text = _format_filter_value(
+                    _safe_get_value(get_element_value, element, value_query)
+                )
+                if value_text is _BOOLEAN_VALUE:
+                    return {"TRUE", "FALSE"}
+                if value_text is not None:
+                    values.add(value_text)
 
         return values
 
@@ -756,18 +1223,17 @@ class IfcCompleter(Completer):
 
     def _determine_filter_completion_type(self, text_before_cursor: str) -> str:
         """Determine what type of filter completion is needed."""
-        debug_print(f"Determining completion type for: '{text_before_cursor}'")
+        if is_debug_enabled():
+            debug_print(f"Determining completion type for: '{text_before_cursor}'")
 
         # Check for value completion (after comparison operators)
-        value_match = re.search(
-            r"(\w+)\s*(>=|<=|!=|\*=|!\*=|>|<|=)\s*", text_before_cursor
-        )
+        value_match = _COMPARISON_RE.search(text_before_cursor)
         if value_match:
             debug_print("Detected attribute value completion")
             return "attribute_values"
 
         # Check for property set property completion: "Pset_WallCommon."
-        pset_prop_match = re.search(r"([PQE][a-zA-Z0-9_]+)\.\s*$", text_before_cursor)
+        pset_prop_match = _PSET_DOT_RE.search(text_before_cursor)
         if pset_prop_match:
             debug_print(
                 f"Detected property set property completion: {pset_prop_match.group(1)}"
@@ -775,9 +1241,7 @@ class IfcCompleter(Completer):
             return "property_names"
 
         # Check for property set name completion: "Pset_", "Qto_", etc.
-        pset_name_match = re.search(
-            r"[,\s]([PQE][a-zA-Z0-9_]*)\s*$", text_before_cursor
-        )
+        pset_name_match = _PSET_PREFIX_RE.search(text_before_cursor)
         if pset_name_match:
             debug_print(
                 f"Detected property set name completion: {pset_name_match.group(1)}"
@@ -785,36 +1249,38 @@ class IfcCompleter(Completer):
             return "property_set_names"
 
         # Check for comparison operator completion after known attributes/keywords
-        trailing_word_match = re.search(
-            r"[,\s]([A-Za-z_][A-Za-z0-9_]*)\s*$", text_before_cursor
-        )
+        trailing_word_match = _TRAILING_WORD_RE.search(text_before_cursor)
         if trailing_word_match:
             word = trailing_word_match.group(1)
-            if word in (self.filter_keywords | self.common_attributes):
+            if word in self._comparable_words:
                 debug_print(f"Detected comparison operator completion after: {word}")
                 return "comparison_operators"
 
+        # The IFC class patterns below cannot match without an "Ifc" token,
+        # which a substring test rules out far more cheaply than a regex
+        has_ifc_class = "Ifc" in text_before_cursor
+
         # FIXED: Check for attributes and keywords after IFC classes
         # This should have higher priority than the general IFC class check
-        if re.search(r"Ifc[A-Za-z0-9]+\s*,\s*", text_before_cursor):
+        if has_ifc_class and _IFC_CLASS_COMMA_RE.search(text_before_cursor):
             debug_print("Detected attributes and keywords completion after IFC class")
             return "attributes_and_keywords"
 
         # Check for trailing comma (after any content): "anything, "
-        if re.search(r",\s*$", text_before_cursor):
+        if _TRAILING_COMMA_RE.search(text_before_cursor):
             debug_print("Detected attributes and keywords completion after comma")
             return "attributes_and_keywords"
 
         # FIXED: Check for space after IFC class without comma: "IfcWall "
-        if re.search(r"Ifc[A-Za-z0-9]+\s+$", text_before_cursor):
+        if has_ifc_class and _IFC_CLASS_SPACE_RE.search(text_before_cursor):
             debug_print("Detected attributes and keywords completion after IFC class with space")
             return "attributes_and_keywords"
 
         # Check for start of query or after separators: "", "+ "
         if (
             not text_before_cursor.strip()
-            or re.search(r"[+]\s*[A-Za-z]*$", text_before_cursor)
-            or re.search(r"^\s*[A-Za-z]*$", text_before_cursor)
+            or _UNION_WORD_RE.search(text_before_cursor)
+            or _LEADING_WORD_RE.search(text_before_cursor)
         ):
             debug_print("Detected IFC class completion (start or after + separator)")
             return "ifc_classes"
@@ -841,12 +1307,13 @@ class IfcCompleter(Completer):
         if value_path.endswith("."):
             # Check if what comes before the dot is a property set name
             base = value_path.rstrip(".")
-            return bool(re.match(r"^(Pset_|Qto_|EPset_|[A-Z]\w*_\w+)$", base))
+            return bool(_PSET_NAME_RE.match(base))
         return False
 
     def _extract_cumulative_filter(self, text_before_cursor: str) -> str:
         """Extract the cumulative filter query from text before cursor."""
-        debug_print(f"Extracting cumulative filter from: '{text_before_cursor}'")
+        if is_debug_enabled():
+            debug_print(f"Extracting cumulative filter from: '{text_before_cursor}'")
 
         text = text_before_cursor.strip()
 
@@ -859,7 +1326,7 @@ class IfcCompleter(Completer):
 
         # Case 1: Text ends with comma and optional whitespace
         if text.endswith(",") or (
-            text.endswith(" ") and "," in text and text.split(",")[-1].strip() == ""
+            text.endswith(" ") and "," in text and not text.rpartition(",")[2].strip()
         ):
             # Find the last comma and use everything before it
             last_comma_pos = text.rfind(",")
@@ -870,51 +1337,41 @@ class IfcCompleter(Completer):
 
         # Case 2: Text ends with incomplete word after comma
         if "," in text:
-            parts = text.split(",")
-            if len(parts) > 1:
-                last_part = parts[-1].strip()
-                everything_before = ",".join(parts[:-1]).strip()
+            everything_before, _, last_part = text.rpartition(",")
+            last_part = last_part.strip()
+            everything_before = everything_before.strip()
 
-                debug_print(
-                    f"Found potential incomplete word: '{last_part}' after comma"
-                )
+            debug_print(f"Found potential incomplete word: '{last_part}' after comma")
 
-                # Check if the last part is actually a complete filter component
-
-                # Has comparison operators - it's complete
-                if any(
-                    op in last_part
-                    for op in [">=", "<=", "!=", "*=", "!*=", ">", "<", "="]
-                ):
-                    debug_print(f"Last part contains operators - including it")
-                    return text
-
-                # Property set with dot - it's complete
-                if (
-                    last_part.startswith(("Pset_", "Qto_", "EPset_"))
-                    and "." in last_part
-                ):
-                    debug_print(f"Last part is property set reference - including it")
-                    return text
-
-                # Known filter keyword - it's complete
-                if last_part in self.filter_keywords:
-                    debug_print(f"Last part is filter keyword - including it")
-                    return text
-
-                # Complete IFC class - it's complete
-                if (
-                    last_part.startswith("Ifc")
-                    and last_part[3:].replace("_", "").isalnum()
-                ):
-                    debug_print(f"Last part is complete IFC class - including it")
-                    return text
-
-                # Otherwise, it's truly incomplete - use everything before the last comma
-                debug_print(
-                    f"Truly incomplete word - using before comma: '{everything_before}'"
-                )
-                return everything_before
+            # Check if the last part is actually a complete filter component
+
+            # Has comparison operators - it's complete
+            if any(
+                op in last_part for op in [">=", "<=", "!=", "*=", "!*=", ">", "<", "="]
+            ):
+                debug_print("Last part contains operators - including it")
+                return text
+
+            # Property set with dot - it's complete
+            if last_part.startswith(("Pset_", "Qto_", "EPset_")) and "." in last_part:
+                debug_print("Last part is property set reference - including it")
+                return text
+
+            # Known filter keyword - it's complete
+            if last_part in self.filter_keywords:
+                debug_print("Last part is filter keyword - including it")
+                return text
+
+            # Complete IFC class - it's complete
+            if last_part.startswith("Ifc") and last_part[3:].replace("_", "").isalnum():
+                debug_print("Last part is complete IFC class - including it")
+                return text
+
+            # Otherwise, it's truly incomplete - use everything before the last comma
+            debug_print(
+                f"Truly incomplete word - using before comma: '{everything_before}'"
+            )
+            return everything_before
 
         # Case 3: No comma structure - use entire text
         debug_print(f"No comma structure found - using entire text: '{text}'")
@@ -922,32 +1379,34 @@ class IfcCompleter(Completer):
 
     def _extract_property_set_prefix(self, text_before_cursor: str) -> str:
         """Extract property set prefix from text."""
-        match = re.search(r"[,\s]([PQE][a-zA-Z0-9_]*)\s*$", text_before_cursor)
+        match = _PSET_PREFIX_RE.search(text_before_cursor)
         return match.group(1) if match else ""
 
     def _extract_property_set_name(self, text_before_cursor: str) -> str:
         """Extract property set name from text."""
-        match = re.search(r"([PQE][a-zA-Z0-9_]+)\.\s*$", text_before_cursor)
+        match = _PSET_DOT_RE.search(text_before_cursor)
         return match.group(1) if match else ""
 
     def _extract_attribute_name(self, text_before_cursor: str) -> str:
         """Extract attribute name from text for value completion."""
-        debug_print(f"Extracting attribute name from: '{text_before_cursor}'")
+        debug = is_debug_enabled()
+        if debug:
+            debug_print(f"Extracting attribute name from: '{text_before_cursor}'")
 
         # Handle property set properties like "Pset_WallCommon.LoadBearing"
-        pset_prop_match = re.search(
-            r"([PQE][a-zA-Z0-9_]+\.[A-Za-z0-9_]+)\s*[>=<!]", text_before_cursor
-        )
+        pset_prop_match = _PSET_PROPERTY_COMPARISON_RE.search(text_before_cursor)
         if pset_prop_match:
             attr_name = pset_prop_match.group(1)
-            debug_print(f"Found property set property: {attr_name}")
+            if debug:
+                debug_print(f"Found property set property: {attr_name}")
             return attr_name
 
         # Handle regular attributes
-        match = re.search(r"(\w+)\s*[>=<!]", text_before_cursor)
+        match = _ATTRIBUTE_COMPARISON_RE.search(text_before_cursor)
         if match:
             attr_name = match.group(1)
-            debug_print(f"Found regular attribute: {attr_name}")
+            if debug:
+                debug_print(f"Found regular attribute: {attr_name}")
             return attr_name
 
         debug_print("No attribute name found")
@@ -957,7 +1416,7 @@ class IfcCompleter(Completer):
         """Extract cumulative filter before property set dot notation."""
         # Remove the "Pset_PropertySetName." part to get valid filter
         # Example: "IfcWall, Pset_WallCommon." -> "IfcWall"
-        match = re.search(r"^(.+?),\s*[PQE][a-zA-Z0-9_]+\.\s*$", text_before_cursor)
+        match = _FILTER_BEFORE_PSET_DOT_RE.search(text_before_cursor)
         if match:
             return match.group(1).strip()
 
@@ -968,12 +1427,12 @@ class IfcCompleter(Completer):
         """Extract cumulative filter before equals sign."""
         # Remove the "AttributeName=value" part to get valid filter
         # Example: "IfcWall, Name=" -> "IfcWall"
-        match = re.search(r"^(.+?),\s*\w+\s*[>=<!]+\s*", text_before_cursor)
+        match = _FILTER_BEFORE_COMMA_COMPARISON_RE.search(text_before_cursor)
         if match:
             return match.group(1).strip()
 
         # Try without comma
-        match = re.search(r"^(.+?)\s+\w+\s*[>=<!]+\s*", text_before_cursor)
+        match = _FILTER_BEFORE_SPACE_COMPARISON_RE.search(text_before_cursor)
         if match:
             return match.group(1).strip()
 
@@ -987,131 +1446,121 @@ class IfcCompleter(Completer):
     def _get_ifc_classes(self) -> Set[str]:
         """Get IFC classes from model (lazy loaded), including parent classes."""
         if self._ifc_classes is None:
-            self._ifc_classes = set()
-            try:
-                # FIXED: Get the actual schema object from ifcopenshell
-                # model.schema is a string like "IFC4", not the schema object
-                import ifcopenshell.ifcopenshell_wrapper as wrapper
-                schema = wrapper.schema_by_name(self.model.schema)
+            self._scan_model()
+        return self._ifc_classes
 
-                # Get classes from actual entities
-                for entity in self.model:
-                    try:
-                        class_name = entity.is_a()
-                        self._ifc_classes.add(class_name)
+    def _get_schema(self) -> Any:
+        """Get the schema definition for the model (lazy loaded)."""
+        if self._schema is None:
+            # FIXED: Get the actual schema object from ifcopenshell
+            # model.schema is a string like "IFC4", not the schema object
+            import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+            self._schema = wrapper.schema_by_name(self.model.schema)
+        return self._schema
+
+    def _get_ifc_classes_with_prefix(self, prefix: str) -> List[str]:
+        """Get IFC classes starting with prefix (case-insensitive), sorted."""
+        if self._ifc_class_index is None:
+            pairs = sorted((name.lower(), name) for name in self._get_ifc_classes())
+            self._ifc_class_index = (
+                [lower for lower, _ in pairs],
+                [name for _, name in pairs],
+            )
 
-                        # Add parent classes by checking schema hierarchy
-                        try:
-                            entity_info = schema.declaration_by_name(class_name)
-                            # Walk up the inheritance hierarchy
-                            # FIXED: supertype is a method, not a property - must call it
-                            current = entity_info
-                            while hasattr(current, "supertype"):
-                                parent = current.supertype()  # Call the method
-                                if parent is None:
-                                    break
-                                parent_name = parent.name()
-                                if parent_name.startswith("Ifc"):
-                                    self._ifc_classes.add(parent_name)
-                                current = parent
-                        except Exception as e:
-                            debug_print(
-                                f"Could not traverse hierarchy for {class_name}: {e}"
-                            )
-                            # No fallback - let it fail if schema traversal doesn't work
+        lowers, names = self._ifc_class_index
+        return _prefix_matches(lowers, names, prefix.lower())
 
-                    except Exception as e:
-                        debug_print(f"Could not process entity: {e}")
-                        continue
+    def _scan_model(self) -> None:
+        """Walk the model once, collecting every IFC class and its parents."""
+        self._ifc_classes = set()
 
-            except Exception as e:
-                debug_print(f"Could not iterate model entities: {e}")
-                # No fallback - empty set if model iteration fails
+        try:
+            schema = self._get_schema()
 
-        return self._ifc_classes
+            # Get classes from actual entities
+            for entity in self.model:
+                try:
+                    class_name = entity.is_a()
 
-    def _get_basic_property_sets(self) -> Set[str]:
-        """Get basic property set names (lazy loaded)."""
-        if self._basic_property_sets is None:
-            self._basic_property_sets = set()
-            try:
-                # Sample IfcPropertySet entities
-                for pset in list(self.model.by_type("IfcPropertySet"))[:20]:
-                    try:
-                        if hasattr(pset, "Name") and pset.Name:
-                            self._basic_property_sets.add(pset.Name)
-                    except Exception:
+                    # A class already recorded, directly or as a parent, has
+                    # had its ancestors added too
+                    if class_name in self._ifc_classes:
                         continue
+                    # Interned so the class index and per-class caches share
+                    # one copy of each name
+                    self._ifc_classes.add(sys.intern(class_name))
 
-                # Sample IfcElementQuantity entities
-                for qset in list(self.model.by_type("IfcElementQuantity"))[:20]:
+                    # Add parent classes by checking schema hierarchy
                     try:
-                        if hasattr(qset, "Name") and qset.Name:
-                            self._basic_property_sets.add(qset.Name)
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-        return self._basic_property_sets
+                        entity_info = schema.declaration_by_name(class_name)
+                        # Walk up the inheritance hierarchy
+                        # FIXED: supertype is a method, not a property - must call it
+                        current = entity_info
+                        while hasattr(current, "supertype"):
+                            parent = current.supertype()  # Call the method
+                            if parent is None:
+                                break
+                            parent_name = parent.name()
+                            if parent_name in self._ifc_classes:
+                                # Its ancestors were added along with it
+                                break
+                            if parent_name.startswith("Ifc"):
+                                self._ifc_classes.add(sys.intern(parent_name))
+                            current = parent
+                    except Exception as e:
+                        debug_print(
+                            f"Could not traverse hierarchy for {class_name}: {e}"
+                        )
+                        # No fallback - let it fail if schema traversal doesn't work
 
-    def _get_basic_properties(self) -> Dict[str, Set[str]]:
-        """Get basic properties by property set (lazy loaded)."""
-        if self._basic_properties is None:
-            self._basic_properties = {}
-            try:
-                # Sample property sets
-                for pset in list(self.model.by_type("IfcPropertySet"))[:20]:
-                    try:
-                        if (
-                            hasattr(pset, "Name")
-                            and pset.Name
-                            and hasattr(pset, "HasProperties")
-                        ):
-                            props = set()
-                            for prop in pset.HasProperties:
-                                if hasattr(prop, "Name") and prop.Name:
-                                    props.add(prop.Name)
-                            if props:
-                                self._basic_properties[pset.Name] = props
-                    except Exception:
-                        continue
+                except Exception as e:
+                    debug_print(f"Could not process entity: {e}")
+                    continue
 
-                # Sample quantity sets
-                for qset in list(self.model.by_type("IfcElementQuantity"))[:20]:
-                    try:
-                        if (
-                            hasattr(qset, "Name")
-                            and qset.Name
-                            and hasattr(qset, "Quantities")
-                        ):
-                            props = set()
-                            for qty in qset.Quantities:
-                                if hasattr(qty, "Name") and qty.Name:
-                                    props.add(qty.Name)
-                            if props:
-                                self._basic_properties[qset.Name] = props
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-        return self._basic_properties
+        except Exception as e:
+            debug_print(f"Could not iterate model entities: {e}")
+            # No fallback - empty set if model iteration fails
 
     # ============================
     # Utility Methods
     # ============================
 
-    def _matches_word(self, completion_text: str, current_word: str) -> bool:
-        """Check if completion matches current word."""
+    def _memoize_text(self, cache: OrderedDict, parse: Any, text: str) -> Any:
+        """Return parse(text), reusing the result cached for the same text."""
+        result = cache.get(text)
+        if result is None:
+            result = parse(text)
+            _lru_store(cache, text, result, _TEXT_CACHE_SIZE)
+        else:
+            cache.move_to_end(text)
+        return result
+
+    def _sorted_matches(self, completions: Set[str], current_word: str) -> List[str]:
+        """Sort the completions matching current word.
+
+        Filtering first means only the matches are sorted, which is usually
+        a small part of the candidates once a word has been started.
+        """
         if not current_word:
-            return True
+            return sorted(completions)
+
+        # Lower-case the word once rather than once per candidate
+        word = current_word.lower()
+        match_text = self._match_text
+        return sorted(
+            completion_text
+            for completion_text in completions
+            if match_text(completion_text).startswith(word)
+        )
 
+    def _match_text(self, completion_text: str) -> str:
+        """Get the lower-cased text a completion is matched against."""
         # Handle quoted completions
         if completion_text.startswith('"') and completion_text.endswith('"'):
-            comparison_text = completion_text[1:-1]
-        else:
-            comparison_text = completion_text
+            completion_text = completion_text[1:-1]
 
-        return comparison_text.lower().startswith(current_word.lower())
+        return completion_text.lower()
 
 
 # ============================
@@ -1,9 +1,13 @@
 """Configuration and file path management with controlled debug output."""
 
+import errno
+import functools
 import os
+import stat
 import sys
-import traceback
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from .exceptions import (
     ConfigurationError,
@@ -12,63 +16,191 @@ from .exceptions import (
 )
 from .debug import (
     debug_print,
+    debug_print_lines,
     verbose_print,
     error_print,
     warning_print,
     is_debug_enabled,
 )
 
+# STEP physical file magic, compared as bytes so no text decoding is needed
+_IFC_MAGIC = b"ISO-10303-21"
+# Bytes read from the start of a file to look for the magic
+_IFC_HEADER_SIZE = 256
 
+# Accepted IFC file suffixes, compared against the lower-cased suffix
+_VALID_IFC_SUFFIXES = frozenset({".ifc"})
+
+# errno values that mean "path does not exist" (mirrors pathlib's exists())
+_MISSING_PATH_ERRNOS = frozenset(
+    {errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP}
+)
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """File metadata from a single stat() call.
+
+    Every check is derived from the one stat result, so validation code
+    cannot accidentally stat the same path twice.
+    """
+
+    st: Optional[os.stat_result]
+
+    @classmethod
+    def probe(cls, path) -> "FileInfo":
+        """Stat path once; a missing path gives a FileInfo with st=None."""
+        try:
+            return cls(os.stat(path))
+        except OSError as stat_error:
+            if stat_error.errno not in _MISSING_PATH_ERRNOS:
+                raise
+            return cls(None)
+
+    @property
+    def exists(self) -> bool:
+        return self.st is not None
+
+    @property
+    def is_file(self) -> bool:
+        return self.st is not None and stat.S_ISREG(self.st.st_mode)
+
+    @property
+    def is_dir(self) -> bool:
+        return self.st is not None and stat.S_ISDIR(self.st.st_mode)
+
+    @property
+    def size(self) -> Optional[int]:
+        return self.st.st_size if self.st is not None else None
+
+    @property
+    def mode_octal(self) -> Optional[str]:
+        return oct(self.st.st_mode) if self.st is not None else None
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to limit characters, marking it with "..." only if cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _read_ifc_header(path: Union[str, os.PathLike]) -> bytes:
+    """Read the first _IFC_HEADER_SIZE bytes of a file in binary mode."""
+    with open(path, "rb") as f:
+        return f.read(_IFC_HEADER_SIZE)
+
+
+def _log_error_context(title: str, build_context: Callable[[], Dict[str, Any]]) -> None:
+    """Report an error, plus a lazily built context when debugging.
+
+    The context is built by calling build_context, so lookups such as
+    Path.cwd() or os.environ only happen when the result will be shown.
+    The error line and its context are written to stderr in one call.
+    """
+    if not is_debug_enabled():
+        error_print(title)
+        return
+    lines = [f"ERROR: {title}", "DEBUG: DEBUG INFORMATION:"]
+    lines.extend(f"DEBUG:   {key}: {value}" for key, value in build_context().items())
+    sys.stderr.write("\n".join(lines) + "\n")
+
+
+def _debug_traceback() -> None:
+    """Print the current exception's traceback, only when debug output is enabled.
+
+    Users see the one-line error message; the full traceback is available
+    with --debug.
+    """
+    if not is_debug_enabled():
+        return
+    import traceback
+
+    debug_print("Full traceback:")
+    traceback.print_exc(file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=1)
+def _home_dir() -> Path:
+    """Return the user's home directory, looked up once per process."""
+    return Path.home()
+
+
+@functools.lru_cache(maxsize=1)
 def get_config_dir() -> Path:
-    """Get XDG-compliant config directory with controlled debug output."""
+    """Get XDG-compliant config directory with controlled debug output.
+
+    The result is cached for the life of the process; call
+    _refresh_env() after changing XDG_STATE_HOME or HOME.
+    """
     try:
-        if xdg_state := os.environ.get("XDG_STATE_HOME"):
-            config_path = Path(xdg_state) / "ifcpeek"
+        # Build each path with a single Path() call rather than chained "/"
+        xdg_state = os.environ.get("XDG_STATE_HOME")
+        if xdg_state:
+            config_path = Path(xdg_state, "ifcpeek")
         else:
-            config_path = Path.home() / ".local" / "state" / "ifcpeek"
+            config_path = Path(_home_dir(), ".local", "state", "ifcpeek")
 
-        # Debug information only if debug mode is enabled
-        debug_print(f"Config directory determined: {config_path}")
-        debug_print(f"XDG_STATE_HOME: {os.environ.get('XDG_STATE_HOME', 'Not set')}")
-        debug_print(f"Home directory: {Path.home()}")
+        # Only format debug messages (and look up home) when they will be shown
+        if is_debug_enabled():
+            debug_print(f"Config directory determined: {config_path}")
+            debug_print(f"XDG_STATE_HOME: {xdg_state or 'Not set'}")
+            debug_print(f"Home directory: {_home_dir()}")
 
         return config_path
 
     except Exception as e:
-        error_context = {
-            "XDG_STATE_HOME": os.environ.get("XDG_STATE_HOME", "Not set"),
-            "HOME": os.environ.get("HOME", "Not set"),
-            "error_type": type(e).__name__,
-        }
-
-        error_print("Failed to determine configuration directory")
-        debug_print("DEBUG INFORMATION:")
-        for key, value in error_context.items():
-            debug_print(f"  {key}: {value}")
-        debug_print("Full traceback:")
-        if is_debug_enabled():
-            traceback.print_exc(file=sys.stderr)
+        # Bind the details so the lazy context does not close over e
+        error_type = type(e).__name__
+        _log_error_context(
+            "Failed to determine configuration directory",
+            lambda: {
+                "XDG_STATE_HOME": os.environ.get("XDG_STATE_HOME", "Not set"),
+                "HOME": os.environ.get("HOME", "Not set"),
+                "error_type": error_type,
+            },
+        )
+        _debug_traceback()
 
         raise ConfigurationError(
-            f"Failed to determine config directory: {e}", system_info=error_context
+            f"Failed to determine config directory: {e}",
+            system_info={"error_type": error_type},
         ) from e
 
 
+@functools.lru_cache(maxsize=1)
+def _compute_history_file_path() -> Path:
+    """Compute the history file path without touching the filesystem (cached)."""
+    history_path = get_config_dir() / "history"
+    if is_debug_enabled():
+        debug_print(f"History file path: {history_path}")
+    return history_path
+
+
 def get_history_file_path() -> Path:
+    """Get history file path with controlled debug output.
+
+    Only builds the path; call ensure_history_file_path() before opening
+    the file so that its directory exists.
+    """
+    return _compute_history_file_path()
+
+
+def ensure_history_file_path() -> Path:
     """Get history file path with controlled debug output, creating directory if needed."""
     try:
-        config_dir = get_config_dir()
+        history_path = get_history_file_path()
+        config_dir = history_path.parent
+        debug = is_debug_enabled()
 
-        debug_print(f"Creating config directory if needed: {config_dir}")
-        debug_print(f"Directory exists: {config_dir.exists()}")
-        debug_print(
-            f"Directory is dir: {config_dir.is_dir() if config_dir.exists() else 'N/A'}"
-        )
+        if debug:
+            debug_print(f"Creating config directory if needed: {config_dir}")
 
-        # Create directory with error handling
+        # Create directory with error handling; exist_ok makes a separate
+        # existence check unnecessary
         try:
             config_dir.mkdir(parents=True, exist_ok=True)
-            debug_print("Directory creation successful")
+            if debug:
+                debug_print("Directory creation successful")
+                debug_print(f"Directory exists: {config_dir.exists()}")
         except PermissionError as perm_error:
             error_print(f"Permission denied creating directory: {config_dir}")
             debug_print(f"Permission error: {perm_error}")
@@ -84,9 +216,6 @@ def get_history_file_path() -> Path:
                 config_path=str(config_dir),
             ) from os_error
 
-        history_path = config_dir / "history"
-        debug_print(f"History file path: {history_path}")
-
         return history_path
 
     except ConfigurationError:
@@ -96,103 +225,114 @@ def get_history_file_path() -> Path:
         error_print("Unexpected error creating history file path")
         debug_print(f"Error type: {type(e).__name__}")
         debug_print(f"Error message: {e}")
-        debug_print("Full traceback:")
-        if is_debug_enabled():
-            traceback.print_exc(file=sys.stderr)
+        _debug_traceback()
 
         raise ConfigurationError(f"Failed to create history file path: {e}") from e
 
 
-def validate_ifc_file_path(file_path: str) -> Path:
+def _refresh_env() -> None:
+    """Forget cached environment-derived paths (HOME, XDG_STATE_HOME).
+
+    Mainly for tests that change the environment between calls.
+    """
+    _home_dir.cache_clear()
+    get_config_dir.cache_clear()
+    _compute_history_file_path.cache_clear()
+
+
+def validate_ifc_file_path(file_path: Union[str, os.PathLike]) -> Path:
     """Validate and return Path object for IFC file with controlled debug output."""
-    # Handle None input early to avoid Path() TypeError
-    if file_path is None:
-        raise TypeError("expected str, bytes or os.PathLike object, not NoneType")
+    # Normalise str/bytes/PathLike input to str; raises TypeError for None
+    file_path = os.fsdecode(file_path)
 
-    try:
-        debug_print(f"Validating IFC file path: {file_path}")
+    # Check the debug flag once; message formatting is skipped entirely when off
+    debug = is_debug_enabled()
 
+    try:
         # Convert to Path object
         path = Path(file_path)
-        debug_print(f"Resolved path: {path}")
-        debug_print(f"Absolute path: {path.resolve()}")
+        # resolve() stats every path component, so it is only computed for
+        # debug output and then reused by the error context below
+        resolved = None
+        if debug:
+            resolved = path.resolve()
+            debug_print(f"Validating IFC file path: {file_path}")
+            debug_print(f"Resolved path: {path}")
+            debug_print(f"Absolute path: {resolved}")
+
+        # Path keeps its string form, so system calls below take the plain str
+        # and skip pathlib's per-call conversion
+        fs_path = os.fspath(path)
+
+        # A single stat() call answers existence, file type and size
+        info = FileInfo.probe(fs_path)
 
         # Check if file exists
-        if not path.exists():
-            error_context = {
-                "provided_path": file_path,
-                "resolved_path": str(path.resolve()),
-                "parent_exists": path.parent.exists(),
-                "current_dir": str(Path.cwd()),
-            }
-
-            error_print("File does not exist")
-            debug_print("DEBUG INFORMATION:")
-            for key, value in error_context.items():
-                debug_print(f"  {key}: {value}")
+        if not info.exists:
+            _log_error_context(
+                "File does not exist",
+                lambda: {
+                    "provided_path": file_path,
+                    "resolved_path": str(resolved or path.absolute()),
+                    "parent_exists": path.parent.exists(),
+                    "current_dir": str(Path.cwd()),
+                },
+            )
 
             raise FileNotFoundError(
                 f"File '{file_path}' not found", file_path=file_path
             )
 
         # Check if it's actually a file (not a directory)
-        if not path.is_file():
-            error_context = {
-                "path": str(path),
-                "exists": path.exists(),
-                "is_dir": path.is_dir(),
-                "is_file": path.is_file(),
-                "is_symlink": path.is_symlink(),
-            }
-
-            error_print("Path exists but is not a file")
-            debug_print("DEBUG INFORMATION:")
-            for key, value in error_context.items():
-                debug_print(f"  {key}: {value}")
+        if not info.is_file:
+            _log_error_context(
+                "Path exists but is not a file",
+                lambda: {
+                    "path": str(path),
+                    "exists": info.exists,
+                    "is_dir": info.is_dir,
+                    "is_file": info.is_file,
+                    # exists/is_dir/is_file come from the stat above;
+                    # only the link check needs its own lstat()
+                    "is_symlink": stat.S_ISLNK(os.lstat(fs_path).st_mode),
+                },
+            )
 
             raise InvalidIfcFileError(
                 f"'{file_path}' is not a file", file_path=file_path
             )
 
-        # Get file statistics for debugging
-        try:
-            stat = path.stat()
-            file_size = stat.st_size
-            file_mode = oct(stat.st_mode)
+        # File statistics for debugging come from the same stat result
+        file_size = info.size
+        if debug:
             debug_print(f"File size: {file_size} bytes")
-            debug_print(f"File permissions: {file_mode}")
-            debug_print(f"File readable: {os.access(path, os.R_OK)}")
-        except Exception as stat_error:
-            warning_print(f"Could not get file statistics: {stat_error}")
-            file_size = None
+            debug_print(f"File permissions: {info.mode_octal}")
+            debug_print(f"File readable: {os.access(fs_path, os.R_OK)}")
 
         # Basic extension check with validation - case insensitive
-        valid_extensions = [".ifc", ".IFC", ".Ifc", ".IfC"]
-        if path.suffix not in valid_extensions:
-            error_context = {
-                "file_path": file_path,
-                "detected_extension": path.suffix,
-                "valid_extensions": valid_extensions,
-                "file_size": file_size,
-            }
-
-            error_print("Invalid file extension")
-            debug_print("DEBUG INFORMATION:")
-            for key, value in error_context.items():
-                debug_print(f"  {key}: {value}")
+        if path.suffix.lower() not in _VALID_IFC_SUFFIXES:
+            _log_error_context(
+                "Invalid file extension",
+                lambda: {
+                    "file_path": file_path,
+                    "detected_extension": path.suffix,
+                    "valid_extensions": [".ifc", ".IFC", ".Ifc"],
+                    "file_size": file_size,
+                },
+            )
 
             # Try to read first few bytes to check for IFC header
             try:
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    first_line = f.readline().strip()
-                    debug_print(f"First line of file: {first_line[:50]}...")
-
-                    if first_line.startswith("ISO-10303-21"):
-                        warning_print("File appears to be IFC format despite extension")
-                        verbose_print("Proceeding with validation...")
-                        return path
-                    else:
-                        debug_print("File does not appear to contain IFC data")
+                head = _read_ifc_header(fs_path).lstrip()
+                if debug:
+                    debug_print(f"First bytes of file: {_truncate(repr(head), 50)}")
+
+                if head.startswith(_IFC_MAGIC):
+                    warning_print("File appears to be IFC format despite extension")
+                    verbose_print("Proceeding with validation...")
+                    return path
+                else:
+                    debug_print("File does not appear to contain IFC data")
             except Exception as read_error:
                 debug_print(f"Could not read file for format validation: {read_error}")
 
@@ -205,33 +345,32 @@ def validate_ifc_file_path(file_path: str) -> Path:
 
         # Additional file content validation
         try:
-            # Try to read the first few lines to validate IFC format
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                first_lines = []
-                for i, line in enumerate(f):
-                    first_lines.append(line.strip())
-                    if i >= 5:  # Read first 6 lines
-                        break
-
-                debug_print("First few lines of file:")
-                for i, line in enumerate(first_lines):
-                    debug_print(f"  Line {i+1}: {line[:100]}...")
-
-                # Check for IFC header
-                if not first_lines or not first_lines[0].startswith("ISO-10303-21"):
-                    warning_print("File does not start with standard IFC header")
-                    debug_print("This might not be a valid IFC file")
-                else:
-                    debug_print("File appears to have valid IFC header")
+            # Read a small binary chunk to validate the IFC header
+            head = _read_ifc_header(fs_path)
+
+            # Only the line dump is debug output; the header warning below is
+            # always shown
+            if debug:
+                lines = ["First few lines of file:"]
+                lines.extend(
+                    f"  Line {i+1}: {_truncate(line.decode('utf-8', 'ignore'), 100)}"
+                    for i, line in enumerate(head.splitlines()[:6])
+                )
+                debug_print_lines(lines)
+
+            # Check for IFC header
+            if not head.lstrip().startswith(_IFC_MAGIC):
+                warning_print("File does not start with standard IFC header")
+                debug_print("This might not be a valid IFC file")
+            else:
+                debug_print("File appears to have valid IFC header")
 
-        except UnicodeDecodeError as unicode_error:
-            warning_print(f"Unicode decode error reading file: {unicode_error}")
-            debug_print("File might be binary or have encoding issues")
         except Exception as read_error:
             warning_print(f"Could not validate file content: {read_error}")
             debug_print("File might be locked or have permission issues")
 
-        debug_print(f"File validation successful: {path}")
+        if debug:
+            debug_print(f"File validation successful: {path}")
         return path
 
     except (FileNotFoundError, InvalidIfcFileError, TypeError):
@@ -239,19 +378,17 @@ def validate_ifc_file_path(file_path: str) -> Path:
         raise
     except Exception as e:
         # Handle any other unexpected errors
-        error_context = {
-            "provided_path": file_path,
-            "error_type": type(e).__name__,
-            "error_message": str(e),
-        }
-
-        error_print("Unexpected error during file validation")
-        debug_print("DEBUG INFORMATION:")
-        for key, value in error_context.items():
-            debug_print(f"  {key}: {value}")
-        debug_print("Full traceback:")
-        if is_debug_enabled():
-            traceback.print_exc(file=sys.stderr)
+        error_type = type(e).__name__
+        error_message = str(e)
+        _log_error_context(
+            "Unexpected error during file validation",
+            lambda: {
+                "provided_path": file_path,
+                "error_type": error_type,
+                "error_message": error_message,
+            },
+        )
+        _debug_traceback()
 
         raise InvalidIfcFileError(
             f"Unexpected error validating file '{file_path}': {e}",
@@ -260,6 +397,18 @@ def validate_ifc_file_path(file_path: str) -> Path:
         ) from e
 
 
+@functools.lru_cache(maxsize=1)
+def _platform_info() -> Tuple[str, str]:
+    """Return (platform description, Python version), computed once.
+
+    platform is imported here rather than at module level as it is only
+    needed for debug reports.
+    """
+    import platform
+
+    return platform.platform(), sys.version
+
+
 def print_debug_info():
     """Print basic debug information for troubleshooting (only if debug enabled)."""
     if not is_debug_enabled():
@@ -269,39 +418,39 @@ def print_debug_info():
         )
         return
 
-    print("=" * 60, file=sys.stderr)
-    print("IFCPEEK CONFIGURATION DEBUG INFORMATION", file=sys.stderr)
-    print("=" * 60, file=sys.stderr)
+    # Collect everything first and emit it with a single write to stderr
+    lines = ["=" * 60, "IFCPEEK CONFIGURATION DEBUG INFORMATION", "=" * 60]
 
     try:
-        import platform
-
-        print(f"Platform: {platform.platform()}", file=sys.stderr)
-        print(f"Python version: {sys.version}", file=sys.stderr)
-        print(f"Current directory: {Path.cwd()}", file=sys.stderr)
-        print(f"Home directory: {Path.home()}", file=sys.stderr)
+        platform_name, python_version = _platform_info()
+        lines.append(f"Platform: {platform_name}")
+        lines.append(f"Python version: {python_version}")
+        lines.append(f"Current directory: {Path.cwd()}")
+        lines.append(f"Home directory: {_home_dir()}")
 
-        print("\nCONFIGURATION PATHS:", file=sys.stderr)
+        lines.append("\nCONFIGURATION PATHS:")
         try:
             config_dir = get_config_dir()
-            print(f"Config directory: {config_dir}", file=sys.stderr)
-            print(f"Config dir exists: {config_dir.exists()}", file=sys.stderr)
+            lines.append(f"Config directory: {config_dir}")
+            lines.append(f"Config dir exists: {config_dir.exists()}")
         except Exception as e:
-            print(f"Config directory error: {e}", file=sys.stderr)
+            lines.append(f"Config directory error: {e}")
 
         try:
             history_path = get_history_file_path()
-            print(f"History file path: {history_path}", file=sys.stderr)
-            print(f"History file exists: {history_path.exists()}", file=sys.stderr)
+            lines.append(f"History file path: {history_path}")
+            lines.append(f"History file exists: {history_path.exists()}")
         except Exception as e:
-            print(f"History file path error: {e}", file=sys.stderr)
+            lines.append(f"History file path error: {e}")
 
     except Exception as e:
-        error_print(f"Could not print debug information: {e}")
-        if is_debug_enabled():
-            traceback.print_exc(file=sys.stderr)
+        import traceback
+
+        lines.append(f"ERROR: Could not print debug information: {e}")
+        lines.append(traceback.format_exc().rstrip("\n"))
 
-    print("=" * 60, file=sys.stderr)
+    lines.append("=" * 60)
+    sys.stderr.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
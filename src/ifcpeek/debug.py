@@ -3,61 +3,99 @@
 import os
 import sys
 
+# Environment variable values that switch a flag on (compared lower-cased)
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Bound once so flag checks skip the os.environ attribute lookup. os.environ
+# is only ever mutated in place, so the bound method stays current.
+_env_get = os.environ.get
+
 
 class DebugManager:
     """Manages debug output for IfcPeek with configurable verbosity."""
 
     def __init__(self):
-        # Don't cache the values - always check environment
-        pass
+        # Parsed flags are memoised against the raw environment values, so the
+        # string parsing only reruns when IFCPEEK_DEBUG/IFCPEEK_VERBOSE change.
+        # os.environ is still consulted on every check, which keeps direct
+        # environment changes (e.g. from __main__ or tests) effective.
+        self._debug_raw = None
+        self._debug = False
+        self._verbose_raw = None
+        self._verbose = False
+        self.refresh()
 
     def _check_debug_enabled(self) -> bool:
         """Check if debug mode is enabled via environment variable."""
-        return os.environ.get("IFCPEEK_DEBUG", "").lower() in ("1", "true", "yes", "on")
+        return _env_get("IFCPEEK_DEBUG", "").lower() in _TRUTHY
 
     def _check_verbose_enabled(self) -> bool:
         """Check if verbose mode is enabled via environment variable."""
-        return os.environ.get("IFCPEEK_VERBOSE", "").lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
+        return _env_get("IFCPEEK_VERBOSE", "").lower() in _TRUTHY
+
+    def refresh(self) -> None:
+        """Re-read the debug and verbose flags from the environment."""
+        self._debug_raw = _env_get("IFCPEEK_DEBUG")
+        self._debug = self._check_debug_enabled()
+        self._verbose_raw = _env_get("IFCPEEK_VERBOSE")
+        self._verbose = self._check_verbose_enabled()
 
     @property
     def debug_enabled(self) -> bool:
-        """Check if debug output is enabled (always checks environment)."""
-        return self._check_debug_enabled()
+        """Check if debug output is enabled (re-parsed only when the environment changes)."""
+        if _env_get("IFCPEEK_DEBUG") != self._debug_raw:
+            self.refresh()
+        return self._debug
 
     @property
     def verbose_enabled(self) -> bool:
-        """Check if verbose output is enabled (always checks environment)."""
-        return self._check_verbose_enabled()
+        """Check if verbose output is enabled (re-parsed only when the environment changes)."""
+        if _env_get("IFCPEEK_VERBOSE") != self._verbose_raw:
+            self.refresh()
+        return self._verbose
+
+    def _check_any_enabled(self) -> bool:
+        """Check if verbose or debug output is enabled, refreshing at most once."""
+        if (
+            _env_get("IFCPEEK_VERBOSE") != self._verbose_raw
+            or _env_get("IFCPEEK_DEBUG") != self._debug_raw
+        ):
+            self.refresh()
+        return self._verbose or self._debug
 
     def enable_debug(self) -> None:
         """Enable debug output."""
         os.environ["IFCPEEK_DEBUG"] = "1"
+        self.refresh()
 
     def disable_debug(self) -> None:
         """Disable debug output."""
         os.environ.pop("IFCPEEK_DEBUG", None)
+        self.refresh()
 
     def enable_verbose(self) -> None:
         """Enable verbose output."""
         os.environ["IFCPEEK_VERBOSE"] = "1"
+        self.refresh()
 
     def disable_verbose(self) -> None:
         """Disable verbose output."""
         os.environ.pop("IFCPEEK_VERBOSE", None)
+        self.refresh()
 
     def debug_print(self, *args, **kwargs) -> None:
         """Print debug message if debug mode is enabled."""
         if self.debug_enabled:
             print("DEBUG:", *args, file=sys.stderr, **kwargs)
 
+    def debug_print_lines(self, lines) -> None:
+        """Print several debug lines with a single write if debug mode is enabled."""
+        if self.debug_enabled:
+            sys.stderr.write("".join(f"DEBUG: {line}\n" for line in lines))
+
     def verbose_print(self, *args, **kwargs) -> None:
         """Print verbose message if verbose mode is enabled."""
-        if self.verbose_enabled or self.debug_enabled:
+        if self._check_any_enabled():
             print(*args, file=sys.stderr, **kwargs)
 
     def error_print(self, *args, **kwargs) -> None:
@@ -106,12 +144,21 @@ def disable_verbose() -> None:
 
 def debug_print(*args, **kwargs) -> None:
     """Print debug message if debug mode is enabled."""
-    _debug_manager.debug_print(*args, **kwargs)
+    # Test the flag here so the common disabled case returns without
+    # forwarding its arguments through a second call
+    if _debug_manager.debug_enabled:
+        print("DEBUG:", *args, file=sys.stderr, **kwargs)
+
+
+def debug_print_lines(lines) -> None:
+    """Print several debug lines with a single write if debug mode is enabled."""
+    _debug_manager.debug_print_lines(lines)
 
 
 def verbose_print(*args, **kwargs) -> None:
     """Print verbose message if verbose or debug mode is enabled."""
-    _debug_manager.verbose_print(*args, **kwargs)
+    if _debug_manager._check_any_enabled():
+        print(*args, file=sys.stderr, **kwargs)
 
 
 def error_print(*args, **kwargs) -> None:
@@ -11,7 +11,7 @@ import ifcopenshell.util.selector
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
 
-from .config import validate_ifc_file_path, get_history_file_path
+from .config import validate_ifc_file_path, ensure_history_file_path
 from .exceptions import InvalidIfcFileError
 from .formatters import format_query_results
 from .value_extraction import ValueExtractor
@@ -145,7 +145,7 @@ class IfcPeek:
     def _create_session(self):
         """Create prompt_toolkit session with enhanced tab completion."""
         try:
-            history_path = get_history_file_path()
+            history_path = ensure_history_file_path()
             file_history = FileHistory(str(history_path))
 
             session = PromptSession(
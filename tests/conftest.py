@@ -23,6 +23,16 @@ if str(tests_path) not in sys.path:
 from test_utils import MockSetup, get_test_ifc_content
 
 
+@pytest.fixture(autouse=True)
+def clear_config_caches():
+    """Reset cached config paths so each test sees its own environment."""
+    from ifcpeek import config
+
+    config._refresh_env()
+    yield
+    config._refresh_env()
+
+
 @pytest.fixture
 def temp_dir():
     """Provide a temporary directory for tests."""
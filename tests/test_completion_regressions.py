@@ -6,8 +6,15 @@ These tests ensure that specific completion bugs that were fixed stay fixed.
 
 import pytest
 from unittest.mock import Mock, patch
+import ifcopenshell.util.element
+import ifcopenshell.util.selector
+from prompt_toolkit.completion import CompleteEvent
 from prompt_toolkit.document import Document
-from ifcpeek.completion import IfcCompleter
+from ifcpeek.completion import (
+    _ATTRIBUTE_VALUE_SAMPLE_SIZE,
+    _VALUE_SAMPLE_SIZE,
+    IfcCompleter,
+)
 
 
 def create_mock_model_with_walls():
@@ -374,3 +381,290 @@ class TestCompletionRegressions:
 
         # Should offer parent class
         assert "IfcBuildingElement" in completion_texts
+
+
+class TestCompletionCaching:
+    """Test that repeated completions reuse earlier model work."""
+
+    def test_value_completions_cached_per_query_and_path(self, completer):
+        """Repeating a value completion should not re-run the filter query."""
+        doc = Document("IfcWall; Pset_WallCommon.", cursor_position=25)
+        first = {c.text for c in completer.get_completions(doc, None)}
+
+        with patch.object(
+            completer, "_apply_cumulative_filter", side_effect=AssertionError
+        ):
+            second = {c.text for c in completer.get_completions(doc, None)}
+
+        assert second == first
+        assert "LoadBearing" in second
+
+    def test_filter_results_cached_per_query(self, completer):
+        """Completing several times under one filter should query the model once."""
+        with patch(
+            "ifcopenshell.util.selector.filter_elements",
+            side_effect=mock_filter_elements,
+        ) as mock_filter:
+            list(completer.get_completions(Document("IfcWall, Name="), None))
+            list(completer.get_completions(Document("IfcWall, Name=e"), None))
+
+        assert mock_filter.call_count == 1
+
+    def test_attributes_inspected_once_per_class(self, completer):
+        """Entities of one class should only be inspected once across completions."""
+        with patch.object(
+            completer,
+            "_inspect_class_attributes",
+            wraps=completer._inspect_class_attributes,
+        ) as mock_inspect:
+            list(completer.get_completions(Document("IfcWall, "), None))
+            list(completer.get_completions(Document("IfcWall; "), None))
+
+        assert mock_inspect.call_count == 1
+
+    def test_model_scanned_once_for_classes(self, completer):
+        """Classes should come from a single lazy model pass."""
+        walls = completer.model.by_type("IfcWall")
+        model_iter = Mock(return_value=iter(walls))
+        completer.model.__iter__ = model_iter
+        completer.model.by_type = Mock(side_effect=AssertionError("by_type used"))
+
+        assert model_iter.call_count == 0
+        assert "IfcWall" in completer._get_ifc_classes()
+        assert "IfcWall" in completer._get_ifc_classes()
+        assert model_iter.call_count == 1
+
+    def test_class_prefix_lookup_is_case_insensitive_and_sorted(self, completer):
+        """Prefix lookups on the class index should match the linear scan."""
+        completer._ifc_classes = {"IfcWall", "IfcWallType", "IfcWindow", "IfcDoor"}
+
+        assert completer._get_ifc_classes_with_prefix("ifcwa") == [
+            "IfcWall",
+            "IfcWallType",
+        ]
+        assert completer._get_ifc_classes_with_prefix("") == sorted(
+            completer._ifc_classes
+        )
+        assert completer._get_ifc_classes_with_prefix("IfcX") == []
+
+    def test_element_classes_read_once_per_element_list(self, completer):
+        """Class samples for a cached element list should not call is_a() again."""
+        walls = completer.model.by_type("IfcWall")
+        samples = completer._get_class_samples(walls)
+
+        for wall in walls:
+            wall.is_a.side_effect = AssertionError("is_a called again")
+
+        assert completer._get_class_samples(walls) is samples
+        assert samples == {"IfcWall": walls[0]}
+
+    def test_schema_resolved_once_per_completer(self, completer):
+        """The schema definition should be looked up once and then reused."""
+        import ifcopenshell.ifcopenshell_wrapper as wrapper
+
+        list(completer.get_completions(Document("IfcW"), None))
+        list(completer.get_completions(Document("IfcWall, "), None))
+
+        assert wrapper.schema_by_name.call_count == 1
+
+    def test_filter_text_parsed_once_per_text(self, completer):
+        """The same filter text should only be parsed once."""
+        with patch.object(
+            completer,
+            "_determine_filter_completion_type",
+            wraps=completer._determine_filter_completion_type,
+        ) as mock_type:
+            document = Document("IfcWall, ")
+            first = [c.text for c in completer.get_completions(document, None)]
+            second = [c.text for c in completer.get_completions(document, None)]
+
+        assert first == second
+        assert mock_type.call_count == 1
+
+    def test_value_sample_reused_for_filter_query(self, completer):
+        """Value completions on one filter should keep sampling the same list."""
+        with patch.object(
+            completer,
+            "_get_class_samples",
+            wraps=completer._get_class_samples,
+        ) as mock_samples:
+            list(completer.get_completions(Document("IfcWall; "), None))
+            completer._value_completion_cache.clear()
+            list(completer.get_completions(Document("IfcWall; "), None))
+
+        sampled_lists = [call.args[0] for call in mock_samples.call_args_list]
+        assert len(sampled_lists) == 2
+        assert sampled_lists[0] is sampled_lists[1]
+
+    def test_value_sample_does_not_cache_full_filter_result(self, completer):
+        """Value completions should only take the sampled elements."""
+        list(completer.get_completions(Document("IfcWall; "), None))
+
+        assert "IfcWall" not in completer._filter_cache
+        assert len(completer._value_samples["IfcWall"]) == 3
+
+    def test_current_word_parsed_once_per_text(self, completer):
+        """The current filter word should be parsed once for the same text."""
+        with patch.object(
+            completer,
+            "_parse_current_word",
+            wraps=completer._parse_current_word,
+        ) as mock_parse:
+            list(completer.get_completions(Document("IfcW"), None))
+            list(completer.get_completions(Document("IfcW"), None))
+
+        assert mock_parse.call_count == 1
+
+    def test_extended_word_narrows_previous_matches(self, completer):
+        """Typing more of a word should filter the last matches, not rebuild them."""
+        first = [
+            c.text for c in completer.get_completions(Document("IfcWall, N"), None)
+        ]
+
+        with patch.object(
+            completer,
+            "_extract_attributes_from_elements",
+            side_effect=AssertionError("candidates rebuilt"),
+        ):
+            second = [
+                c.text for c in completer.get_completions(Document("IfcWall, Na"), None)
+            ]
+
+        assert "Name" in second
+        assert second == [text for text in first if text.lower().startswith("na")]
+
+    def test_attribute_values_cached_per_filter_and_attribute(self, completer):
+        """Values after "=" should be read from the elements only once."""
+        with patch.object(
+            completer,
+            "_extract_attribute_values",
+            wraps=completer._extract_attribute_values,
+        ) as mock_extract:
+            document = Document("IfcWall, Name=")
+            first = [c.text for c in completer.get_completions(document, None)]
+            completer._last_filter_matches = None
+            second = [c.text for c in completer.get_completions(document, None)]
+
+        assert first == second
+        assert '"exterior"' in first
+        assert mock_extract.call_count == 1
+
+    def test_filter_candidates_built_once_per_filter(self, completer):
+        """Attributes after a filter should be gathered once, then merged sorted."""
+        with patch.object(
+            completer,
+            "_extract_attributes_from_elements",
+            wraps=completer._extract_attributes_from_elements,
+        ) as mock_extract:
+            first = [
+                c.text for c in completer.get_completions(Document("IfcWall, N"), None)
+            ]
+            completer._last_filter_matches = None
+            second = [
+                c.text for c in completer.get_completions(Document("IfcWall, "), None)
+            ]
+
+        assert "Name" in first
+        assert first == [text for text in second if text.lower().startswith("n")]
+        assert second == sorted(set(second))
+        assert mock_extract.call_count == 1
+
+    def test_plain_object_class_attributes_cached_per_type(self, completer):
+        """dir() of a plain value's class should be walked once per type."""
+
+        class Placement:
+            Location = None
+
+            def __init__(self, ref):
+                self.RefDirection = ref
+
+        first = completer._inspect_object_attributes(Placement(1))
+        with patch("builtins.dir", side_effect=AssertionError("dir() called")):
+            second = completer._inspect_object_attributes(Placement(2))
+
+        assert first == second == {"Location", "RefDirection"}
+
+    @pytest.mark.parametrize(
+        "text, expected", [("I", "IfcWall"), ("IfcWall, N", "Name")]
+    )
+    def test_short_word_only_completed_on_request(self, completer, text, expected):
+        """A one-character current word should only be completed when requested."""
+        document = Document(text)
+
+        unrequested = list(completer.get_completions(document, CompleteEvent()))
+        requested = list(
+            completer.get_completions(
+                document, CompleteEvent(completion_requested=True)
+            )
+        )
+
+        assert unrequested == []
+        assert expected in [c.text for c in requested]
+
+    def test_longer_word_completed_without_request(self, completer):
+        """A current word of two or more characters completes without a request."""
+        document = Document("IfcWall, Na")
+
+        completions = list(completer.get_completions(document, CompleteEvent()))
+
+        assert "Name" in [c.text for c in completions]
+
+    def test_boolean_attribute_stops_reading_values(self, completer):
+        """Once a boolean value is seen, the other elements are not read."""
+        with patch(
+            "ifcopenshell.util.selector.get_element_value",
+            side_effect=[True, "Wall"],
+        ) as mock_get_value:
+            values = completer._extract_attribute_values(
+                [Mock(), Mock()], "IsExternal"
+            )
+
+        assert values == {"TRUE", "FALSE"}
+        assert mock_get_value.call_count == 1
+
+    @pytest.mark.parametrize(
+        "count",
+        [
+            _VALUE_SAMPLE_SIZE + 1,
+            _VALUE_SAMPLE_SIZE * 2 - 1,
+            _VALUE_SAMPLE_SIZE * 2,
+            _VALUE_SAMPLE_SIZE * 3 - 1,
+        ],
+    )
+    def test_value_sample_spread_across_filter_result(self, completer, count):
+        """Large filter results should be sampled across their whole length."""
+        walls = completer.model.by_type("IfcWall")
+        doors = [Mock() for _ in range(count - len(walls))]
+        elements = doors + list(walls)
+        completer._filter_cache["IfcDoor, IfcWall"] = elements
+
+        sample = completer._get_value_sample("IfcDoor, IfcWall")
+
+        assert len(sample) == _VALUE_SAMPLE_SIZE
+        assert sample[0] is doors[0]
+        assert any(element in walls for element in sample)
+        # The last pick falls within the final stride of the result
+        last_index = max(elements.index(element) for element in sample)
+        assert last_index >= count - count // _VALUE_SAMPLE_SIZE - 1
+
+    def test_property_sets_read_once_per_element(self, completer):
+        """Property set completions should reuse each element's get_psets()."""
+        get_psets = ifcopenshell.util.element.get_psets
+        walls = completer.model.by_type("IfcWall")
+
+        list(completer.get_completions(Document("IfcWall; Pset_WallCommon."), None))
+        list(completer.get_completions(Document("IfcWall, Pset_WallCommon."), None))
+
+        assert get_psets.call_count == len(walls)
+
+    def test_attribute_values_read_from_sample_of_large_filter(self, completer):
+        """Values after "=" should come from a bounded sample of the elements."""
+        walls = list(completer.model.by_type("IfcWall"))
+        completer._filter_cache["IfcWall"] = walls * 100
+        get_value = ifcopenshell.util.selector.get_element_value
+        get_value.reset_mock()
+
+        values = completer._get_attribute_values("IfcWall", "Name")
+
+        assert '"exterior"' in values
+        assert get_value.call_count == _ATTRIBUTE_VALUE_SAMPLE_SIZE
@@ -7,6 +7,9 @@ from unittest.mock import patch
 import pytest
 
 from ifcpeek.config import (
+    FileInfo,
+    _refresh_env,
+    ensure_history_file_path,
     get_config_dir,
     get_history_file_path,
     validate_ifc_file_path,
@@ -44,22 +47,41 @@ class TestConfigDirectory:
         expected = Path("/home/user") / ".local" / "state" / "ifcpeek"
         assert config_dir == expected
 
+    def test_get_config_dir_is_cached(self):
+        """Test config directory is cached until the cache is cleared."""
+        with patch.dict(os.environ, {"XDG_STATE_HOME": "/first/state"}):
+            first = get_config_dir()
+        with patch.dict(os.environ, {"XDG_STATE_HOME": "/second/state"}):
+            assert get_config_dir() == first
+            _refresh_env()
+            assert get_config_dir() == Path("/second/state") / "ifcpeek"
+
 
 class TestHistoryFilePath:
     """Test history file path management."""
 
-    def test_get_history_file_path_creates_directory(self, temp_dir):
-        """Test that history file path creates necessary directories."""
+    def test_get_history_file_path_does_not_create_directory(self, temp_dir):
+        """Test that looking up the history path does no filesystem work."""
         config_path = temp_dir / "config"
 
         with patch("ifcpeek.config.get_config_dir", return_value=config_path):
             history_path = get_history_file_path()
 
+        assert not config_path.exists()
+        assert history_path == config_path / "history"
+
+    def test_ensure_history_file_path_creates_directory(self, temp_dir):
+        """Test that ensuring the history file path creates necessary directories."""
+        config_path = temp_dir / "config"
+
+        with patch("ifcpeek.config.get_config_dir", return_value=config_path):
+            history_path = ensure_history_file_path()
+
         assert config_path.exists()
         assert config_path.is_dir()
         assert history_path == config_path / "history"
 
-    def test_get_history_file_path_permission_error(self, temp_dir):
+    def test_ensure_history_file_path_permission_error(self, temp_dir):
         """Test history file path with permission errors."""
         readonly_dir = temp_dir / "readonly"
         readonly_dir.mkdir()
@@ -73,7 +95,7 @@ class TestHistoryFilePath:
                     ConfigurationError,
                     match="Failed to create history file path.*Permission denied",
                 ):
-                    get_history_file_path()
+                    ensure_history_file_path()
             finally:
                 readonly_dir.chmod(stat.S_IRWXU)  # Restore for cleanup
 
@@ -117,7 +139,7 @@ class TestFileValidation:
 
     def test_validate_case_insensitive_extension(self, temp_dir):
         """Test validation accepts case-insensitive IFC extensions."""
-        extensions = [".ifc", ".IFC", ".Ifc", ".IfC"]
+        extensions = [".ifc", ".IFC", ".Ifc", ".IfC", ".iFc", ".ifC"]
 
         for ext in extensions:
             ifc_file = temp_dir / f"test{ext}"
@@ -138,6 +160,45 @@ class TestFileValidation:
         result = validate_ifc_file_path(str(ifc_file))
         assert result == ifc_file
 
+    def test_missing_ifc_header_warns_without_debug(self, temp_dir, capsys):
+        """Test that a .ifc file without the IFC header warns when debug is off."""
+        ifc_file = temp_dir / "plain.ifc"
+        ifc_file.write_text("Not an IFC file")
+
+        with patch.dict(os.environ, {"IFCPEEK_DEBUG": "0"}):
+            assert validate_ifc_file_path(str(ifc_file)) == ifc_file
+
+        stderr = capsys.readouterr().err
+        assert "WARNING: File does not start with standard IFC header" in stderr
+        assert "First few lines of file:" not in stderr
+
+
+class TestFileInfo:
+    """Test single-stat file metadata."""
+
+    def test_probe_regular_file(self, temp_dir):
+        """Test FileInfo for an existing regular file."""
+        ifc_file = temp_dir / "info.ifc"
+        ifc_file.write_text("ISO-10303-21;")
+
+        info = FileInfo.probe(ifc_file)
+
+        assert info.exists and info.is_file and not info.is_dir
+        assert info.size == len("ISO-10303-21;")
+
+    def test_probe_directory(self, temp_dir):
+        """Test FileInfo for a directory."""
+        info = FileInfo.probe(temp_dir)
+
+        assert info.exists and info.is_dir and not info.is_file
+
+    def test_probe_missing_path(self, temp_dir):
+        """Test FileInfo for a path that does not exist."""
+        info = FileInfo.probe(temp_dir / "missing.ifc")
+
+        assert not info.exists and not info.is_file
+        assert info.size is None
+
 
 class TestDebugMode:
     """Test debug mode functionality."""
@@ -165,6 +226,26 @@ class TestDebugMode:
             else:
                 os.environ["IFCPEEK_DEBUG"] = original_debug
 
+    def test_debug_error_context_for_missing_file(self, temp_dir, capsys):
+        """Test that the error context is printed with one DEBUG prefix per line."""
+        original_debug = os.environ.get("IFCPEEK_DEBUG")
+        os.environ["IFCPEEK_DEBUG"] = "1"
+
+        try:
+            with pytest.raises(FileNotFoundError):
+                validate_ifc_file_path(str(temp_dir / "missing.ifc"))
+
+            debug_output = capsys.readouterr().err
+
+            assert "DEBUG: DEBUG INFORMATION:" in debug_output
+            assert "DEBUG:   provided_path:" in debug_output
+            assert "DEBUG:   current_dir:" in debug_output
+        finally:
+            if original_debug is None:
+                os.environ.pop("IFCPEEK_DEBUG", None)
+            else:
+                os.environ["IFCPEEK_DEBUG"] = original_debug
+
     def test_debug_mode_disabled_by_default(self, temp_dir, capsys):
         """Test that debug output is disabled by default."""
         original_debug = os.environ.get("IFCPEEK_DEBUG")
@@ -209,6 +290,14 @@ class TestEdgeCases:
         with pytest.raises(TypeError, match="expected str, bytes or os.PathLike"):
             validate_ifc_file_path(None)
 
+    def test_path_object_input(self, temp_dir):
+        """Test that a Path object is accepted as well as a string."""
+        ifc_file = temp_dir / "path_input.ifc"
+        ifc_file.write_text("ISO-10303-21;")
+
+        result = validate_ifc_file_path(ifc_file)
+        assert result == ifc_file
+
     def test_current_directory_path(self):
         """Test handling of current directory path."""
         with pytest.raises(InvalidIfcFileError, match="is not a file"):
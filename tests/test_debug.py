@@ -0,0 +1,113 @@
+"""Tests for debug output control."""
+
+import os
+from unittest.mock import patch
+
+from ifcpeek import debug
+from ifcpeek.debug import DebugManager
+
+
+class TestDebugManager:
+    """Test DebugManager flag handling."""
+
+    def test_enable_and_disable_debug(self):
+        """Test enable_debug/disable_debug update the flag immediately."""
+        manager = DebugManager()
+
+        with patch.dict(os.environ, {}, clear=True):
+            manager.refresh()
+            assert not manager.debug_enabled
+
+            manager.enable_debug()
+            assert manager.debug_enabled
+
+            manager.disable_debug()
+            assert not manager.debug_enabled
+
+    def test_direct_environment_change_is_detected(self):
+        """Test that setting IFCPEEK_DEBUG directly still takes effect."""
+        manager = DebugManager()
+
+        with patch.dict(os.environ, {}, clear=True):
+            manager.refresh()
+            assert not manager.debug_enabled
+
+            os.environ["IFCPEEK_DEBUG"] = "true"
+            assert manager.debug_enabled
+
+            os.environ["IFCPEEK_DEBUG"] = "0"
+            assert not manager.debug_enabled
+
+    def test_truthy_values(self):
+        """Test every accepted spelling enables debug, case-insensitively."""
+        manager = DebugManager()
+
+        for value in ("1", "true", "TRUE", "Yes", "on"):
+            with patch.dict(os.environ, {"IFCPEEK_DEBUG": value}, clear=True):
+                assert manager.debug_enabled, value
+
+        for value in ("", "0", "false", "off", "debug"):
+            with patch.dict(os.environ, {"IFCPEEK_DEBUG": value}, clear=True):
+                assert not manager.debug_enabled, value
+
+    def test_verbose_flag(self):
+        """Test verbose flag parsing and toggling."""
+        manager = DebugManager()
+
+        with patch.dict(os.environ, {"IFCPEEK_VERBOSE": "yes"}, clear=True):
+            assert manager.verbose_enabled
+
+            manager.disable_verbose()
+            assert not manager.verbose_enabled
+
+    def test_verbose_print_follows_either_flag(self, capsys):
+        """Test verbose_print prints when verbose or debug is set, not otherwise."""
+        manager = DebugManager()
+
+        with patch.dict(os.environ, {}, clear=True):
+            manager.verbose_print("quiet")
+            os.environ["IFCPEEK_VERBOSE"] = "1"
+            manager.verbose_print("verbose")
+            os.environ.pop("IFCPEEK_VERBOSE")
+            os.environ["IFCPEEK_DEBUG"] = "on"
+            manager.verbose_print("debug")
+
+        err = capsys.readouterr().err
+        assert "quiet" not in err
+        assert "verbose" in err
+        assert "debug" in err
+
+    def test_debug_print_only_when_enabled(self, capsys):
+        """Test debug_print writes to stderr only when debug is enabled."""
+        manager = DebugManager()
+
+        with patch.dict(os.environ, {}, clear=True):
+            manager.debug_print("hidden")
+            manager.enable_debug()
+            manager.debug_print("shown")
+
+        err = capsys.readouterr().err
+        assert "DEBUG: shown" in err
+        assert "hidden" not in err
+
+
+class TestModuleFunctions:
+    """Test the module-level debug helpers."""
+
+    def test_debug_print_follows_environment(self, capsys):
+        """Test module debug_print honours direct IFCPEEK_DEBUG changes."""
+        with patch.dict(os.environ, {}, clear=True):
+            debug.debug_print("hidden")
+            os.environ["IFCPEEK_DEBUG"] = "1"
+            debug.debug_print("shown")
+
+        err = capsys.readouterr().err
+        assert "DEBUG: shown" in err
+        assert "hidden" not in err
+
+    def test_verbose_print_enabled_by_debug(self, capsys):
+        """Test verbose_print also prints when only debug is enabled."""
+        with patch.dict(os.environ, {"IFCPEEK_DEBUG": "1"}, clear=True):
+            debug.verbose_print("details")
+
+        assert "details" in capsys.readouterr().err